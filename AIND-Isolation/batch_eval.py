@@ -0,0 +1,250 @@
+"""This file contains batch versions of the evaluation functions in
+`sample_players.py` and `game_agent.py` that score every child of a game
+state at once using NumPy.
+
+A batch evaluation function has the signature `batch_fn(game, moves, player)`
+and returns the scores (from the point of view of `player`) of the boards
+obtained by applying each move in `moves` for the active player of `game`,
+in the same order.  `AlphaBetaPlayer(batch_score_fn=...)` uses it to score
+the leaves below a node on the last ply of the search in one call instead
+of applying each move and calling `score_fn` on every leaf.
+
+The batch functions return exactly the same values as their scalar
+counterparts:
+
+    batch_improved_score  <->  sample_players.improved_score
+    batch_custom_score    <->  game_agent.custom_score
+    batch_custom_score_2  <->  game_agent.custom_score_2
+    batch_custom_score_3  <->  game_agent.custom_score_3
+"""
+import numpy as np
+
+from isolation.bitboard import DIRECTIONS
+
+# Knight-move tables and centrality scores cached for each (width, height)
+_knight_tables = {}
+_centrality_tables = {}
+
+
+def knight_table(width, height):
+    """Return an array of shape (width * height, 8) listing the cells a knight
+    can reach from each cell, indexed by `row + column * height`.
+
+    Moves that leave the board are padded with the index `width * height`,
+    which is a sentinel cell that is always blocked in the arrays returned by
+    `occupancy_array()`.
+    """
+    table = _knight_tables.get((width, height))
+    if table is None:
+        size = width * height
+        table = np.full((size, len(DIRECTIONS)), size, dtype=np.intp)
+        for idx in range(size):
+            r, c = idx % height, idx // height
+            for k, (dr, dc) in enumerate(DIRECTIONS):
+                if 0 <= r + dr < height and 0 <= c + dc < width:
+                    table[idx, k] = r + dr + (c + dc) * height
+        _knight_tables[(width, height)] = table
+    return table
+
+
+def centrality_table(width, height):
+    """Return an array with the value of `game_agent.centrality_score()` for a
+    player standing on each cell, indexed by `row + column * height`.
+    """
+    table = _centrality_tables.get((width, height))
+    if table is None:
+        center_y_pos, center_x_pos = height / 2, width / 2
+        table = np.array([
+            (width - center_x_pos) ** 2 + (height - center_y_pos) ** 2 -
+            (idx // height - center_x_pos) ** 2 - (idx % height - center_y_pos) ** 2
+            for idx in range(width * height)])
+        _centrality_tables[(width, height)] = table
+    return table
+
+
+def occupancy_array(game):
+    """Return a boolean array of length `width * height + 1` that is True for
+    the blocked cells of the board (and for the trailing sentinel cell).
+    """
+    size = game.width * game.height
+    mask = game.get_occupancy_mask() | 1 << size
+    data = np.frombuffer(mask.to_bytes(size // 8 + 1, "little"), dtype=np.uint8)
+    return np.unpackbits(data, bitorder="little")[:size + 1].astype(bool)
+
+
+def child_mobility(game, moves):
+    """Return the number of legal moves available to each player in the
+    boards obtained by applying each of the moves for the active player.
+
+    Parameters
+    ----------
+    game : `isolation.Board`
+        The parent game state.
+
+    moves : list<(int, int)>
+        Legal moves for the active player of the parent game state.
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        The cell index of each move, the number of moves available to the
+        player who moved, and the number available to their opponent (who
+        holds the initiative in the child boards).
+    """
+    height = game.height
+    table = knight_table(game.width, height)
+    blocked = occupancy_array(game)
+    cells = np.array([r + c * height for r, c in moves], dtype=np.intp)
+
+    mover_moves = (~blocked[table[cells]]).sum(axis=1)
+
+    opp_loc = game.get_player_location(game.inactive_player)
+    if opp_loc is None:
+        opp_moves = np.full(len(cells), (~blocked[:-1]).sum() - 1)
+    else:
+        opp_targets = table[opp_loc[0] + opp_loc[1] * height]
+        opp_moves = ((~blocked[opp_targets]).sum() -
+                     (cells[:, None] == opp_targets).any(axis=1))
+    return cells, mover_moves, opp_moves
+
+
+def _terminal_scores(scores, game, opp_moves, player):
+    """Replace the scores of children where the player to move is out of legal
+    moves with +inf or -inf from the point of view of `player`, and return
+    the scores as a list of floats.
+    """
+    if player == game.active_player:
+        return np.where(opp_moves == 0, float("inf"), scores).tolist()
+    return np.where(opp_moves == 0, float("-inf"), scores).tolist()
+
+
+def batch_improved_score(game, moves, player):
+    """Batch version of `sample_players.improved_score()`: the difference in
+    the number of moves available to the two players in each child board.
+
+    Parameters
+    ----------
+    game : `isolation.Board`
+        The parent game state.
+
+    moves : list<(int, int)>
+        Legal moves for the active player of the parent game state.
+
+    player : object
+        A player instance in the current game.
+
+    Returns
+    -------
+    list<float>
+        The heuristic value of each child board to the specified player.
+    """
+    if not moves:
+        return []
+    _, mover_moves, opp_moves = child_mobility(game, moves)
+    diff = (mover_moves - opp_moves).astype(float)
+    if player != game.active_player:
+        diff = -diff
+    return _terminal_scores(diff, game, opp_moves, player)
+
+
+def _mobility_terms(game, moves, player):
+    """Return the number of moves available to `player` and to their opponent
+    in each child board, the difference in their centrality scores, and the
+    number of moves available to the player to move in each child.
+    """
+    cells, mover_moves, opp_moves = child_mobility(game, moves)
+    centrality = centrality_table(game.width, game.height)
+    mover_centrality = centrality[cells]
+    opp_loc = game.get_player_location(game.inactive_player)
+    opp_centrality = centrality[opp_loc[0] + opp_loc[1] * game.height]
+    if player == game.active_player:
+        return (mover_moves, opp_moves,
+                mover_centrality - opp_centrality, opp_moves)
+    return (opp_moves, mover_moves,
+            opp_centrality - mover_centrality, opp_moves)
+
+
+def batch_custom_score(game, moves, player):
+    """Batch version of `game_agent.custom_score()`: the difference in the
+    number of moves available to each player (counting the opponent's moves
+    twice) plus the difference in centrality of the two players.
+
+    Parameters
+    ----------
+    game : `isolation.Board`
+        The parent game state.
+
+    moves : list<(int, int)>
+        Legal moves for the active player of the parent game state.
+
+    player : object
+        A player instance in the current game.
+
+    Returns
+    -------
+    list<float>
+        The heuristic value of each child board to the specified player.
+    """
+    if not moves:
+        return []
+    own, opp, centrality, to_move = _mobility_terms(game, moves, player)
+    scores = (own - 2 * opp).astype(float) + centrality
+    return _terminal_scores(scores, game, to_move, player)
+
+
+def batch_custom_score_2(game, moves, player):
+    """Batch version of `game_agent.custom_score_2()`: `custom_score()` plus
+    the `common_moves_score()` term (the opponent's number of moves whenever
+    the player has any moves left).
+
+    Parameters
+    ----------
+    game : `isolation.Board`
+        The parent game state.
+
+    moves : list<(int, int)>
+        Legal moves for the active player of the parent game state.
+
+    player : object
+        A player instance in the current game.
+
+    Returns
+    -------
+    list<float>
+        The heuristic value of each child board to the specified player.
+    """
+    if not moves:
+        return []
+    own, opp, centrality, to_move = _mobility_terms(game, moves, player)
+    common = np.where(own > 0, opp, 0)
+    scores = (own - 2 * opp).astype(float) + centrality + common
+    return _terminal_scores(scores, game, to_move, player)
+
+
+def batch_custom_score_3(game, moves, player):
+    """Batch version of `game_agent.custom_score_3()`: `custom_score()` minus
+    the `common_moves_score()` term (the opponent's number of moves whenever
+    the player has any moves left).
+
+    Parameters
+    ----------
+    game : `isolation.Board`
+        The parent game state.
+
+    moves : list<(int, int)>
+        Legal moves for the active player of the parent game state.
+
+    player : object
+        A player instance in the current game.
+
+    Returns
+    -------
+    list<float>
+        The heuristic value of each child board to the specified player.
+    """
+    if not moves:
+        return []
+    own, opp, centrality, to_move = _mobility_terms(game, moves, player)
+    common = np.where(own > 0, opp, 0)
+    scores = (own - 2 * opp).astype(float) + centrality - common
+    return _terminal_scores(scores, game, to_move, player)
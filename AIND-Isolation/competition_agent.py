@@ -4,12 +4,10 @@ champions) in a tournament.
 
          COMPLETING AND SUBMITTING A COMPETITION AGENT IS OPTIONAL
 """
-import random
+import os
 
-
-class SearchTimeout(Exception):
-    """Subclass base exception for code clarity. """
-    pass
+from game_agent import AlphaBetaPlayer, SearchTimeout
+from opening_book import BOOK_FILE, OpeningBook
 
 
 def custom_score(game, player):
@@ -33,10 +31,19 @@ def custom_score(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    raise NotImplementedError
+    own_moves, opp_moves = game.get_mobility(player)
+    if not own_moves and player == game.active_player:
+        return float("-inf")
+
+    if not opp_moves and player == game.inactive_player:
+        return float("inf")
 
+    # Chase the opponent harder as the board fills up
+    aggression = 1. + game.move_count / (game.width * game.height)
+    return float(len(own_moves) - aggression * len(opp_moves))
 
-class CustomPlayer:
+
+class CustomPlayer(AlphaBetaPlayer):
     """Game-playing agent to use in the optional player vs player Isolation
     competition.
 
@@ -59,12 +66,21 @@ class CustomPlayer:
         the PvP competition uses more accurate timers that are not cross-
         platform compatible, so a limit of 1ms (vs 10ms for the other classes)
         is generally sufficient.
+
+    book : str or `opening_book.OpeningBook` (optional)
+        An opening book, or the path of an opening book file built with
+        `opening_book.py`. Moves in the book are played without searching;
+        the player searches with iterative deepening alpha-beta once the
+        game leaves the book, and solves partitioned endgames exactly. The
+        book is skipped if the file is missing.
     """
 
-    def __init__(self, data=None, timeout=1.):
-        self.score = custom_score
-        self.time_left = None
-        self.TIMER_THRESHOLD = timeout
+    def __init__(self, data=None, timeout=1., book=BOOK_FILE):
+        super().__init__(score_fn=custom_score, timeout=timeout,
+                         endgame_solver=True)
+        if isinstance(book, str):
+            book = OpeningBook.load(book) if os.path.exists(book) else None
+        self.book = book
 
     def get_move(self, game, time_left):
         """Search for the best move from the available legal moves and return a
@@ -93,5 +109,10 @@ class CustomPlayer:
             Board coordinates corresponding to a legal move; may return
             (-1, -1) if there are no available legal moves.
         """
-        # OPTIONAL: Finish this function!
-        raise NotImplementedError
+        self.time_left = time_left
+        if self.book is not None:
+            move = self.book.lookup(game)
+            if move is not None and move in game.get_legal_moves():
+                self.reset_search_state()
+                return move
+        return super().get_move(game, time_left)
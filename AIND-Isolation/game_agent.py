@@ -4,11 +4,16 @@ and include the results in your report.
 """
 import random
 
+from isolation.endgame import EndgameSolver
+
 
 class SearchTimeout(Exception):
     """Subclass base exception for code clarity. """
     pass
 
+# Mixed into transposition table keys when the searching player moves second
+_SECOND_PLAYER_KEY = 0x9E3779B97F4A7C15
+
 def centrality_score(game, player):
     center_y_pos, center_x_pos = game.height / 2, game.width / 2
     player_y_pos, player_x_pos = game.get_player_location(player)
@@ -41,15 +46,14 @@ def custom_score(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
+    own_moves, opp_moves = game.get_mobility(player)
+    if not own_moves and player == game.active_player:
         return float("-inf")
 
-    if game.is_winner(player):
+    if not opp_moves and player == game.inactive_player:
         return float("inf")
 
-    own_moves_count = len(game.get_legal_moves(player))
-    opp_moves_count = len(game.get_legal_moves(game.get_opponent(player)))
-    aggressive_improved_score = float(own_moves_count - 2 * opp_moves_count)
+    aggressive_improved_score = float(len(own_moves) - 2 * len(opp_moves))
     own_centrality_score = centrality_score(game, player)
     opp_centrality_score = centrality_score(game, game.get_opponent(player))
     improved_centrality_score = float(own_centrality_score - opp_centrality_score)
@@ -78,14 +82,13 @@ def custom_score_2(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
+    own_moves, opp_moves = game.get_mobility(player)
+    if not own_moves and player == game.active_player:
         return float("-inf")
 
-    if game.is_winner(player):
+    if not opp_moves and player == game.inactive_player:
         return float("inf")
 
-    own_moves = game.get_legal_moves(player)
-    opp_moves = game.get_legal_moves(game.get_opponent(player))
     aggressive_improved_score = float(len(own_moves) - 2 * len(opp_moves))
     own_centrality_score = centrality_score(game, player)
     opp_centrality_score = centrality_score(game, game.get_opponent(player))
@@ -116,14 +119,13 @@ def custom_score_3(game, player):
     float
         The heuristic value of the current game state to the specified player.
     """
-    if game.is_loser(player):
+    own_moves, opp_moves = game.get_mobility(player)
+    if not own_moves and player == game.active_player:
         return float("-inf")
 
-    if game.is_winner(player):
+    if not opp_moves and player == game.inactive_player:
         return float("inf")
 
-    own_moves = game.get_legal_moves(player)
-    opp_moves = game.get_legal_moves(game.get_opponent(player))
     aggressive_improved_score = float(len(own_moves) - 2 * len(opp_moves))
     own_centrality_score = centrality_score(game, player)
     opp_centrality_score = centrality_score(game, game.get_opponent(player))
@@ -132,6 +134,162 @@ def custom_score_3(game, player):
     return aggressive_improved_score + improved_centrality_score - comm_moves_score
 
 
+class TranspositionTable:
+    """Fixed-size table caching the results of previous alpha-beta searches,
+    indexed by the Zobrist hash of the game state.
+
+    Each slot holds a single entry; when two positions map to the same slot,
+    the new entry replaces the stored one if the stored entry is from an
+    older search or was searched to a shallower (or equal) depth.
+
+    Parameters
+    ----------
+    size_mb : float (optional)
+        The approximate maximum amount of memory (in megabytes) used by the
+        table.
+    """
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # Depth stored for results that do not depend on the search depth
+    # because no line below the position reached the depth limit
+    SOLVED = float("inf")
+
+    # Approximate memory used by one stored entry (slot, tuple, key & score)
+    ENTRY_BYTES = 200
+
+    def __init__(self, size_mb=16):
+        self.capacity = max(1, int(size_mb * 2 ** 20) // self.ENTRY_BYTES)
+        self.clear()
+
+    def clear(self):
+        """Remove all entries from the table. """
+        self._slots = [None] * self.capacity
+        self.generation = 0
+
+    def new_search(self):
+        """Mark existing entries as belonging to an older search so they are
+        the first to be replaced.
+        """
+        self.generation += 1
+
+    def lookup(self, key):
+        """Return the entry stored for the hash key as a tuple (key, depth,
+        score, flag, best_move, generation), or None if there is no entry.
+        """
+        entry = self._slots[key % self.capacity]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, score, flag, best_move):
+        """Store the result of searching the position with the given hash key
+        to the given depth, subject to the replacement policy.
+
+        Parameters
+        ----------
+        key : int
+            The hash of the searched game state
+
+        depth : int
+            The number of plies searched below the game state
+
+        score : float
+            The score returned by the search
+
+        flag : int
+            TranspositionTable.EXACT if the score is exact, LOWER if it is a
+            lower bound (beta cutoff), or UPPER if it is an upper bound
+
+        best_move : (int, int)
+            The best move found in the game state (or None)
+        """
+        idx = key % self.capacity
+        entry = self._slots[idx]
+        if (entry is None or entry[0] == key or
+                entry[5] != self.generation or depth >= entry[1]):
+            self._slots[idx] = (key, depth, score, flag, best_move, self.generation)
+
+
+class SearchStats:
+    """Counters describing a single search performed by `AlphaBetaPlayer`.
+
+    Attributes
+    ----------
+    nodes : int
+        The number of game states visited (including leaves).
+
+    leaf_evaluations : int
+        The number of game states scored with the evaluation function.
+
+    cutoffs : int
+        The number of alpha and beta cutoffs.
+
+    tt_hits : int
+        The number of nodes resolved from the transposition table.
+
+    completed_depth : int
+        The depth of the deepest completed iterative deepening pass.
+
+    depth_nodes : list<int>
+        The number of nodes visited by each completed pass.
+
+    depth_times : list<float>
+        The time (in milliseconds) taken by each completed pass.
+
+    search_time : float
+        The total time (in milliseconds) spent in get_move().
+
+    timeout_margin : float
+        The number of milliseconds left on the clock when get_move()
+        returned.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.leaf_evaluations = 0
+        self.cutoffs = 0
+        self.tt_hits = 0
+        self.completed_depth = 0
+        self.depth_nodes = []
+        self.depth_times = []
+        self.search_time = 0.
+        self.timeout_margin = None
+
+    @property
+    def nodes_per_second(self):
+        """The number of nodes visited per second of search time. """
+        if not self.search_time:
+            return None
+        return 1000. * self.nodes / self.search_time
+
+    @property
+    def effective_branching_factor(self):
+        """The ratio of the number of nodes visited by the last completed pass
+        to the number visited by the pass before it (None if fewer than two
+        passes completed).
+        """
+        counts = self.depth_nodes
+        if len(counts) < 2 or not counts[-2]:
+            return None
+        return counts[-1] / counts[-2]
+
+    def as_dict(self):
+        """Return the counters as a dictionary (e.g., to be logged by
+        `Board.play()` or sent back from a worker process).
+        """
+        return {"nodes": self.nodes,
+                "leaf_evaluations": self.leaf_evaluations,
+                "cutoffs": self.cutoffs,
+                "tt_hits": self.tt_hits,
+                "completed_depth": self.completed_depth,
+                "depth_nodes": list(self.depth_nodes),
+                "depth_times": list(self.depth_times),
+                "search_time": self.search_time,
+                "timeout_margin": self.timeout_margin}
+
+
 class IsolationPlayer:
     """Base class for minimax and alphabeta agents -- this class is never
     constructed or tested directly.
@@ -160,6 +318,15 @@ class IsolationPlayer:
         self.time_left = None
         self.TIMER_THRESHOLD = timeout
 
+    def __getstate__(self):
+        """Drop the timer when pickling (e.g., to send the player to a worker
+        process); it is only valid for the current turn and is usually a
+        lambda, which cannot be pickled.
+        """
+        state = self.__dict__.copy()
+        state["time_left"] = None
+        return state
+
 
 class MinimaxPlayer(IsolationPlayer):
     """Game-playing agent that chooses a move using depth-limited minimax
@@ -254,6 +421,10 @@ class MinimaxPlayer(IsolationPlayer):
         if self.time_left() < self.TIMER_THRESHOLD:
             raise SearchTimeout()
 
+        # Search on a single private copy of the board, applying and undoing
+        # moves in-place instead of forecasting a new board for every node
+        game = game.copy()
+
         def min_value(game, level):
             if self.time_left() < self.TIMER_THRESHOLD:
                 raise SearchTimeout()
@@ -262,7 +433,9 @@ class MinimaxPlayer(IsolationPlayer):
             else:
                 v = float("inf")
                 for m in game.get_legal_moves():
-                    v = min(v, max_value(game.forecast_move(m), level+1))
+                    game.push_move(m)
+                    v = min(v, max_value(game, level+1))
+                    game.pop_move()
                 return v
     
         def max_value(game, level):
@@ -273,14 +446,19 @@ class MinimaxPlayer(IsolationPlayer):
             else:     
                 v = float("-inf")
                 for m in game.get_legal_moves():
-                    v = max(v, min_value(game.forecast_move(m), level+1))
+                    game.push_move(m)
+                    v = max(v, min_value(game, level+1))
+                    game.pop_move()
                 return v
         
         best_score = float("-inf")
         best_move = (-1, -1)
         for move in game.get_legal_moves():
-            minValue = min_value(game.forecast_move(move), 1)
-            if minValue > best_score:
+            game.push_move(move)
+            minValue = min_value(game, 1)
+            game.pop_move()
+            # Always keep a legal move, even if every move loses
+            if minValue > best_score or best_move == (-1, -1):
                 best_score = minValue
                 best_move = move
         return best_move
@@ -290,8 +468,118 @@ class AlphaBetaPlayer(IsolationPlayer):
     """Game-playing agent that chooses a move using iterative deepening minimax
     search with alpha-beta pruning. You must finish and test this player to
     make sure it returns a good move before the search time limit expires.
+
+    Parameters
+    ----------
+    search_depth : int (optional)
+        See `IsolationPlayer`.
+
+    score_fn : callable (optional)
+        See `IsolationPlayer`.
+
+    timeout : float (optional)
+        See `IsolationPlayer`.
+
+    tt_size_mb : float (optional)
+        Maximum size (in megabytes) of the transposition table used to reuse
+        search results across iterative deepening passes; 0 disables the
+        transposition table.
+
+    move_ordering : bool (optional)
+        If True, search the principal variation from the previous iteration
+        first, followed by killer moves for the ply and then the remaining
+        moves by decreasing history score.
+
+    deterministic : bool (optional)
+        If True, break ties in the move ordering by board coordinates
+        instead of the random order returned by `Board.get_legal_moves()`,
+        so that repeated searches of a position visit the same nodes.
+
+    batch_score_fn : callable (optional)
+        A batch version of `score_fn` (see `batch_eval.py`) called as
+        `batch_score_fn(game, moves, player)` to score the children of a node
+        on the last ply of the search at once. The first child is always
+        scored on its own so that cut nodes keep their cutoff, and the rest
+        are batched only when at least `BATCH_MIN_LEAVES` remain. With the
+        cheap mobility heuristics on a 7x7 board the NumPy call overhead
+        roughly cancels the savings, so this is mostly useful for more
+        expensive evaluation functions or larger boards.
+
+    time_management : bool (optional)
+        If True, do not start an iterative deepening pass that is not
+        expected to finish before the timeout, estimating its duration from
+        the duration and effective branching factor of the previous pass.
+
+    endgame_solver : bool (optional)
+        If True, solve game states where the players can no longer reach
+        each other (see `Board.is_partitioned()`) exactly with an
+        `isolation.endgame.EndgameSolver`, falling back to iterative
+        deepening if the solver uses up half of the remaining time.  The
+        solver cache is kept between moves.
     """
 
+    # Smallest number of remaining leaves below a node scored with a single
+    # call to batch_score_fn
+    BATCH_MIN_LEAVES = 4
+
+    def __init__(self, search_depth=3, score_fn=custom_score, timeout=10.,
+                 tt_size_mb=16, move_ordering=True, deterministic=False,
+                 batch_score_fn=None, time_management=True,
+                 endgame_solver=False):
+        super().__init__(search_depth, score_fn, timeout)
+        self.tt = TranspositionTable(tt_size_mb) if tt_size_mb else None
+        self.move_ordering = move_ordering
+        self.deterministic = deterministic
+        self.batch_score = batch_score_fn
+        self.time_management = time_management
+        self.endgame = EndgameSolver() if endgame_solver else None
+        self.reset_search_state()
+
+    def reset_search_state(self):
+        """Clear the move ordering tables and start a new `SearchStats`. """
+        self._pv = []
+        self._killers = []
+        self._history = {}
+        self._root_score = float("-inf")
+        self._reached_horizon = True
+        self._partial_move = None
+        self._partial_score = float("-inf")
+        self.search_stats = SearchStats()
+
+    def next_depth_fits(self):
+        """Return False if the next iterative deepening pass is not expected
+        to finish before the search timeout.
+
+        The duration of the next pass is estimated as the duration of the
+        last completed pass multiplied by the effective branching factor
+        observed so far.
+        """
+        stats = self.search_stats
+        ebf = stats.effective_branching_factor
+        if ebf is None:
+            return True
+        estimate = stats.depth_times[-1] * max(ebf, 1.)
+        return estimate < self.time_left() - self.TIMER_THRESHOLD
+
+    def solve_endgame(self, game):
+        """Return the move that starts the longest path of the active player
+        in a partitioned game state, or None if the endgame solver did not
+        finish within half of the remaining time.
+        """
+        deadline = max(self.time_left() / 2., self.TIMER_THRESHOLD)
+
+        def check():
+            if self.time_left() < deadline:
+                raise SearchTimeout()
+
+        nodes = self.endgame.nodes
+        try:
+            move, _, _ = self.endgame.solve(game, check)
+        except SearchTimeout:
+            move = None
+        self.search_stats.nodes += self.endgame.nodes - nodes
+        return move
+
     def get_move(self, game, time_left):
         """Search for the best move from the available legal moves and return a
         result before the time limit expires.
@@ -323,20 +611,49 @@ class AlphaBetaPlayer(IsolationPlayer):
             (-1, -1) if there are no available legal moves.
         """
         self.time_left = time_left
+        if self.tt is not None:
+            self.tt.clear()
+        self.reset_search_state()
+        stats = self.search_stats
+        search_start = time_left()
+
+        if self.endgame is not None and game.is_partitioned():
+            move = self.solve_endgame(game)
+            if move is not None:
+                stats.timeout_margin = time_left()
+                stats.search_time = search_start - stats.timeout_margin
+                return move
 
         best_move = (-1, -1)
+        best_score = float("-inf")
         depth = 1
         try:
-            while True:
+            while not self.time_management or self.next_depth_fits():
+                nodes = stats.nodes
+                depth_start = time_left()
                 temp = self.alphabeta(game, depth)
+                stats.depth_nodes.append(stats.nodes - nodes)
+                stats.depth_times.append(depth_start - time_left())
+                stats.completed_depth = depth
                 if temp:
                     best_move = temp
+                    best_score = self._root_score
+                # Stop when no line reached the depth limit, since deeper
+                # passes would search exactly the same tree
+                if not self._reached_horizon:
+                    break
                 depth = depth + 1
 
         except SearchTimeout:
-            return best_move  # Handle any actions required after timeout as needed
+            # Keep the best move from the interrupted pass if its score beats
+            # the result of the last completed pass
+            if self._partial_move is not None and (
+                    self._partial_score > best_score or best_move == (-1, -1)):
+                best_move = self._partial_move
 
         # Return the best move from the last completed search iteration
+        stats.timeout_margin = time_left()
+        stats.search_time = search_start - stats.timeout_margin
         return best_move
 
     def alphabeta(self, game, depth, alpha=float("-inf"), beta=float("inf")):
@@ -387,39 +704,218 @@ class AlphaBetaPlayer(IsolationPlayer):
         if self.time_left() < self.TIMER_THRESHOLD:
             raise SearchTimeout()
 
-        def min_value(game, level, alpha, beta):
+        # Search on a single private copy of the board, applying and undoing
+        # moves in-place instead of forecasting a new board for every node
+        game = game.copy()
+
+        # Scores are always from the point of view of this player, so the
+        # transposition table keys include which player is searching
+        tt = self.tt
+        salt = _SECOND_PLAYER_KEY if game.move_count % 2 else 0
+        if tt is not None:
+            tt.new_search()
+
+        # Principal variation found below each ply in the current search,
+        # the principal variation of the previous iteration, and the killer
+        # moves and history scores used for move ordering
+        pv_table = [[] for _ in range(depth + 1)]
+        prev_pv = self._pv
+        killers = self._killers
+        while len(killers) <= depth:
+            killers.append([])
+        history = self._history
+        batch_score = self.batch_score
+        stats = self.search_stats
+
+        # Number of nodes whose score depends on the depth limit: leaves
+        # scored with the evaluation function and reused table entries that
+        # were not solved
+        horizon = 0
+
+        def probe(game, level, alpha, beta):
+            """Return (key, score, best_move) from the transposition table,
+            where score is None unless the stored result can be reused.
+            """
+            nonlocal horizon
+            key = game.hash() ^ salt
+            entry = tt.lookup(key)
+            if entry is None:
+                return key, None, None
+            _, entry_depth, score, flag, best_move, _ = entry
+            if entry_depth >= depth - level:
+                if (flag == TranspositionTable.EXACT or
+                        (flag == TranspositionTable.LOWER and score >= beta) or
+                        (flag == TranspositionTable.UPPER and score <= alpha)):
+                    if entry_depth != TranspositionTable.SOLVED:
+                        horizon += 1
+                    return key, score, best_move
+            return key, None, best_move
+
+        def ordered_moves(game, level, tt_move, on_pv):
+            moves = game.get_legal_moves()
+            if self.deterministic:
+                moves.sort()
+            if not self.move_ordering:
+                if tt_move is not None and tt_move in moves:
+                    moves.remove(tt_move)
+                    moves.insert(0, tt_move)
+                return moves
+            pv_move = prev_pv[level] if on_pv and level < len(prev_pv) else None
+            level_killers = killers[level]
+            side = level % 2
+            moves.sort(key=lambda m: (m != pv_move, m != tt_move,
+                                      m not in level_killers,
+                                      -history.get((side, m), 0)))
+            return moves
+
+        def record_cutoff(level, move):
+            stats.cutoffs += 1
+            level_killers = killers[level]
+            if move not in level_killers:
+                level_killers.insert(0, move)
+                del level_killers[2:]
+            remaining = depth - level
+            key = (level % 2, move)
+            history[key] = history.get(key, 0) + remaining * remaining
+
+        def bound_flag(v, alpha, beta):
+            """Return the type of bound that a score returned by a search
+            with the window (alpha, beta) places on the true minimax value.
+            """
+            if v <= alpha:
+                return TranspositionTable.UPPER
+            if v >= beta:
+                return TranspositionTable.LOWER
+            return TranspositionTable.EXACT
+
+        def min_value(game, level, alpha, beta, on_pv):
             if self.time_left() < self.TIMER_THRESHOLD:
                 raise SearchTimeout()
+            nonlocal horizon
+            stats.nodes += 1
+            pv_table[level] = []
             if level >= depth:  
+                stats.leaf_evaluations += 1
+                horizon += 1
                 return self.score(game, self)
-            else:
-                v = float("inf")
-                for m in game.get_legal_moves():
-                    v = min(v, max_value(game.forecast_move(m), level+1, alpha, beta))
-                    if v <= alpha:
-                        return v
-                    beta = min(beta, v)
-                return v
+            tt_move = None
+            if tt is not None:
+                key, tt_score, tt_move = probe(game, level, alpha, beta)
+                if tt_score is not None:
+                    stats.tt_hits += 1
+                    return tt_score
+            v = float("inf")
+            best_move = None
+            alpha_orig, beta_orig = alpha, beta
+            horizon_orig = horizon
+            moves = ordered_moves(game, level, tt_move, on_pv)
+            leaf_scores = None
+            batch_leaves = batch_score is not None and level + 1 == depth
+            for i, m in enumerate(moves):
+                if batch_leaves and i == 1 and len(moves) > self.BATCH_MIN_LEAVES:
+                    # The first child did not cause a cutoff, so score the
+                    # remaining leaves together if there are enough of them
+                    # to pay for the overhead of the batch call
+                    leaf_scores = batch_score(game, moves[1:], self)
+                if leaf_scores is not None:
+                    stats.nodes += 1
+                    stats.leaf_evaluations += 1
+                    horizon += 1
+                    score = leaf_scores[i-1]
+                else:
+                    game.push_move(m)
+                    score = max_value(game, level+1, alpha, beta, on_pv and i == 0)
+                    game.pop_move()
+                if score < v:
+                    v, best_move = score, m
+                    pv_table[level] = [m] + pv_table[level+1]
+                if v <= alpha:
+                    record_cutoff(level, m)
+                    break
+                beta = min(beta, v)
+            if tt is not None:
+                searched = (depth - level if horizon != horizon_orig else
+                            TranspositionTable.SOLVED)
+                tt.store(key, searched, v,
+                         bound_flag(v, alpha_orig, beta_orig), best_move)
+            return v
     
-        def max_value(game, level, alpha, beta):
+        def max_value(game, level, alpha, beta, on_pv):
             if self.time_left() < self.TIMER_THRESHOLD:
                 raise SearchTimeout()
+            nonlocal horizon
+            stats.nodes += 1
+            pv_table[level] = []
             if level >= depth:  
+                stats.leaf_evaluations += 1
+                horizon += 1
                 return self.score(game, self)
-            else:     
-                v = float("-inf")
-                for m in game.get_legal_moves():
-                    v = max(v, min_value(game.forecast_move(m), level+1, alpha, beta))
-                    if v >= beta:
-                        return v
-                    alpha = max(alpha, v)
-                return v
-        
+            tt_move = None
+            if tt is not None:
+                key, tt_score, tt_move = probe(game, level, alpha, beta)
+                if tt_score is not None:
+                    stats.tt_hits += 1
+                    return tt_score
+            v = float("-inf")
+            best_move = None
+            alpha_orig, beta_orig = alpha, beta
+            horizon_orig = horizon
+            moves = ordered_moves(game, level, tt_move, on_pv)
+            leaf_scores = None
+            batch_leaves = batch_score is not None and level + 1 == depth
+            for i, m in enumerate(moves):
+                if batch_leaves and i == 1 and len(moves) > self.BATCH_MIN_LEAVES:
+                    # The first child did not cause a cutoff, so score the
+                    # remaining leaves together if there are enough of them
+                    # to pay for the overhead of the batch call
+                    leaf_scores = batch_score(game, moves[1:], self)
+                if leaf_scores is not None:
+                    stats.nodes += 1
+                    stats.leaf_evaluations += 1
+                    horizon += 1
+                    score = leaf_scores[i-1]
+                else:
+                    game.push_move(m)
+                    score = min_value(game, level+1, alpha, beta, on_pv and i == 0)
+                    game.pop_move()
+                if score > v:
+                    v, best_move = score, m
+                    pv_table[level] = [m] + pv_table[level+1]
+                if v >= beta:
+                    record_cutoff(level, m)
+                    break
+                alpha = max(alpha, v)
+            if tt is not None:
+                searched = (depth - level if horizon != horizon_orig else
+                            TranspositionTable.SOLVED)
+                tt.store(key, searched, v,
+                         bound_flag(v, alpha_orig, beta_orig), best_move)
+            return v
+
+        root_move = None
+        if tt is not None:
+            root_key = game.hash() ^ salt
+            entry = tt.lookup(root_key)
+            if entry is not None:
+                root_move = entry[4]
+
         best_score = float("-inf")
         best_move = (-1, -1)
-        for move in game.get_legal_moves():
-            minValue = min_value(game.forecast_move(move), 1, best_score, float("inf"))
-            if minValue > best_score:
+        self._partial_move = None
+        for i, move in enumerate(ordered_moves(game, 0, root_move, True)):
+            game.push_move(move)
+            minValue = min_value(game, 1, best_score, float("inf"), i == 0)
+            game.pop_move()
+            # Always keep a legal move, even if every move loses
+            if minValue > best_score or best_move == (-1, -1):
                 best_score = minValue
                 best_move = move
-        return best_move
\ No newline at end of file
+                pv_table[0] = [move] + pv_table[1]
+                self._partial_move, self._partial_score = best_move, best_score
+        if tt is not None and best_move != (-1, -1):
+            searched = depth if horizon else TranspositionTable.SOLVED
+            tt.store(root_key, searched, best_score, TranspositionTable.EXACT, best_move)
+        self._pv = pv_table[0]
+        self._root_score = best_score
+        self._reached_horizon = horizon > 0
+        return best_move
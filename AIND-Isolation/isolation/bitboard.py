@@ -0,0 +1,250 @@
+"""
+This file contains the `BitBoard` class, an alternative engine for the game
+Isolation that stores the set of blocked cells as a single integer bitmask
+instead of a list of cell values.
+
+Every cell of the board is assigned the bit `row + column * height` (the same
+index used by `isolation.Board`), and the knight moves available from each
+cell are precomputed once per board size as a bitmask.  The legal moves for a
+player are then the bitwise AND of the knight-move mask for their location
+with the complement of the occupancy mask.
+
+`BitBoard` is a drop-in replacement for `Board`: all of the public methods
+(`get_legal_moves`, `forecast_move`, `apply_move`, `utility`, etc.) accept
+and return the same values.
+"""
+import random
+
+from .isolation import (Board, DIRECTIONS, cell_coords, knight_move_masks,
+                        popcount)
+
+
+class BitBoard(Board):
+    """Implement a model for the game Isolation assuming each player moves like
+    a knight in chess, using an integer bitmask to track blocked cells.
+
+    Parameters
+    ----------
+    player_1 : object
+        An object with a get_move() function. This is the only function
+        directly called by the Board class for each player.
+
+    player_2 : object
+        An object with a get_move() function. This is the only function
+        directly called by the Board class for each player.
+
+    width : int (optional)
+        The number of columns that the board should have.
+
+    height : int (optional)
+        The number of rows that the board should have.
+    """
+
+    def _init_cells(self):
+        """Create the occupancy mask and player locations of an empty board.
+        """
+        # Blocked cells are set bits of the occupancy mask and the player
+        # locations are stored as cell indices (player 1, player 2)
+        self._occupied = 0
+        self._locations = [Board.NOT_MOVED, Board.NOT_MOVED]
+        self._move_masks = knight_move_masks(self.width, self.height)
+        self._coords = cell_coords(self.width, self.height)
+        self._full_mask = (1 << (self.width * self.height)) - 1
+
+    def _copy_cells(self, new_board):
+        """Give a shallow copy of this board its own list of player
+        locations (the occupancy mask is an immutable integer).
+        """
+        new_board._locations = list(self._locations)
+
+    @property
+    def _board_state(self):
+        """The board state in the list layout used by `Board` (cell values
+        followed by the initiative and the player 2 and player 1 locations),
+        built from the occupancy mask for code that reads it directly.
+        """
+        size = self.width * self.height
+        state = [self._occupied >> idx & 1 for idx in range(size)]
+        return state + [self.move_count % 2, self._locations[1], self._locations[0]]
+
+    def move_is_legal(self, move):
+        """Test whether a move is legal in the current game state.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+
+        Returns
+        -------
+        bool
+            Returns True if the move is legal, False otherwise
+        """
+        return (0 <= move[0] < self.height and 0 <= move[1] < self.width and
+                not self._occupied >> (move[0] + move[1] * self.height) & 1)
+
+    def get_blank_spaces(self):
+        """Return a list of the locations that are still available on the board.
+        """
+        return self._mask_to_moves(self._full_mask & ~self._occupied)
+
+    def get_occupancy_mask(self):
+        """Return an integer bitmask of the blocked cells on the board, where
+        the cell (row, column) corresponds to bit `row + column * height`.
+        """
+        return self._occupied
+
+    def get_player_location(self, player):
+        """Find the current location of the specified player on the board.
+
+        Parameters
+        ----------
+        player : object
+            An object registered as a player in the current game.
+
+        Returns
+        -------
+        (int, int) or None
+            The coordinate pair (row, column) of the input player, or None
+            if the player has not moved.
+        """
+        idx = self._location_index(player)
+        if idx == Board.NOT_MOVED:
+            return Board.NOT_MOVED
+        return self._coords[idx]
+
+    def _generate_moves(self, player):
+        """Generate the list of legal moves for the specified player. """
+        idx = self._location_index(player)
+        if idx == Board.NOT_MOVED:
+            return self.get_blank_spaces()
+        valid_moves = self._mask_to_moves(self._move_masks[idx] & ~self._occupied)
+        random.shuffle(valid_moves)
+        return valid_moves
+
+    def count_legal_moves(self, player=None):
+        """Return the number of legal moves for the specified player without
+        building the list of moves.
+
+        Parameters
+        ----------
+        player : object (optional)
+            An object registered as a player in the current game. If None,
+            count the legal moves for the active player on the board.
+
+        Returns
+        -------
+        int
+            The number of legal moves available to the player.
+        """
+        if player is None:
+            player = self._active_player
+        idx = self._location_index(player)
+        if idx == Board.NOT_MOVED:
+            return popcount(self._full_mask & ~self._occupied)
+        return popcount(self._move_masks[idx] & ~self._occupied)
+
+    def apply_move(self, move):
+        """Move the active player to a specified location.
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+        """
+        idx = move[0] + move[1] * self.height
+        player_idx = self._active_player == self._player_2
+        cell_keys, location_keys, initiative_key = self._zobrist
+        player_keys = location_keys[player_idx]
+        prev_idx = self._locations[player_idx]
+        if prev_idx != Board.NOT_MOVED:
+            self._hash ^= player_keys[prev_idx]
+        self._hash ^= cell_keys[idx] ^ player_keys[idx] ^ initiative_key
+        self._locations[player_idx] = idx
+        self._occupied |= 1 << idx
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self.move_count += 1
+        self._p1_moves = self._p2_moves = None
+
+    def push_move(self, move):
+        """Apply a move to the board in-place and record the information
+        needed to undo it with pop_move().
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+        """
+        self._undo_stack.append(
+            (self._locations[self._active_player == self._player_2], self._hash))
+        self.apply_move(move)
+
+    def pop_move(self):
+        """Undo the most recent move applied with push_move().
+
+        Returns
+        -------
+        (int, int)
+            The coordinate pair (row, column) of the move that was undone.
+        """
+        prev_loc, self._hash = self._undo_stack.pop()
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self.move_count -= 1
+        player_idx = self._active_player == self._player_2
+        idx = self._locations[player_idx]
+        self._occupied ^= 1 << idx
+        self._locations[player_idx] = prev_loc
+        self._p1_moves = self._p2_moves = None
+        return self._coords[idx]
+
+    def to_string(self, symbols=['1', '2']):
+        """Generate a string representation of the current game state, marking
+        the location of each player and indicating which cells have been
+        blocked, and which remain open.
+        """
+        p1_loc, p2_loc = self._locations
+
+        col_margin = len(str(self.height - 1)) + 1
+        prefix = "{:<" + "{}".format(col_margin) + "}"
+        offset = " " * (col_margin + 3)
+        out = offset + '   '.join(map(str, range(self.width))) + '\n\r'
+        for i in range(self.height):
+            out += prefix.format(i) + ' | '
+            for j in range(self.width):
+                idx = i + j * self.height
+                if not self._occupied >> idx & 1:
+                    out += ' '
+                elif p1_loc == idx:
+                    out += symbols[0]
+                elif p2_loc == idx:
+                    out += symbols[1]
+                else:
+                    out += '-'
+                out += ' | '
+            out += '\n\r'
+
+        return out
+
+    def _location_index(self, player):
+        """Return the cell index of the specified player, or Board.NOT_MOVED
+        if the player has not moved yet.
+        """
+        if player == self._player_1:
+            return self._locations[0]
+        elif player == self._player_2:
+            return self._locations[1]
+        raise RuntimeError(
+            "Invalid player in get_player_location: {}".format(player))
+
+    def _mask_to_moves(self, mask):
+        """Convert a bitmask of cells into a list of (row, column) pairs. """
+        coords = self._coords
+        moves = []
+        while mask:
+            low_bit = mask & -mask
+            moves.append(coords[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return moves
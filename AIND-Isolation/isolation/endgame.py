@@ -0,0 +1,141 @@
+"""
+This file contains an exact solver for partitioned Isolation endgames.
+
+Once no blank cell can be reached by both players (see
+`Board.is_partitioned()`), the players can no longer block each other and
+the game reduces to which player can make the longer sequence of knight
+moves in their own region.  The player to move wins if and only if their
+longest path is strictly longer than their opponent's.
+
+The longest path of a knight from a cell through a set of free cells is
+found by depth-first search, memoized on the pair (region bitmask, cell)
+where the region is the set of free cells still reachable from the cell.
+The region left after a move is a subset of the current region, so the
+cache entries computed on one turn are reused on the following turns.
+"""
+from .isolation import knight_move_masks, popcount, reachable_mask
+
+
+class EndgameSolver:
+    """Memoized longest-path solver for partitioned game states.
+
+    Parameters
+    ----------
+    cache_size : int (optional)
+        The maximum number of (region, cell) results kept in the cache; the
+        cache is cleared when it fills up.
+
+    Attributes
+    ----------
+    nodes : int
+        The number of (region, cell) pairs expanded since the solver was
+        created.
+    """
+    # Number of expanded nodes between calls to the `check` callback
+    CHECK_INTERVAL = 256
+
+    def __init__(self, cache_size=2 ** 20):
+        self.cache_size = cache_size
+        self.nodes = 0
+        self._cache = {}
+        self._size = None
+        self._move_masks = None
+        self._check = None
+
+    def longest_path(self, region, start, check=None):
+        """Return the largest number of knight moves that can be made from
+        the cell index `start` through the free cells in `region`, each cell
+        being visited at most once.
+
+        Parameters
+        ----------
+        region : int
+            A bitmask of the free cells reachable from `start`.
+
+        start : int
+            The cell index of the knight.
+
+        check : callable (optional)
+            Called every `CHECK_INTERVAL` nodes; it may raise an exception
+            (e.g., a search timeout) to abort the solver. The cache keeps
+            every result completed before the abort.
+
+        Returns
+        -------
+        int
+            The length of the longest path.
+        """
+        self._check = check
+        return self._longest(region, start)
+
+    def solve(self, game, check=None):
+        """Solve a partitioned game state.
+
+        Parameters
+        ----------
+        game : `isolation.Board`
+            A game state where `game.is_partitioned()` is True.
+
+        check : callable (optional)
+            See `longest_path()`.
+
+        Returns
+        -------
+        ((int, int), int, int)
+            The move that starts the longest path of the active player
+            ((-1, -1) if they have no legal moves), the length of that path,
+            and the length of the longest path of the inactive player. The
+            active player wins if and only if their path is longer.
+        """
+        self._check = check
+        width, height = game.width, game.height
+        if self._size != (width, height):
+            self._cache = {}
+            self._size = (width, height)
+            self._move_masks = knight_move_masks(width, height)
+
+        own_region = game.get_reachable_mask(game.active_player)
+        best_move, best_length = (-1, -1), 0
+        for move in sorted(game.get_legal_moves()):
+            idx = move[0] + move[1] * height
+            rest = own_region & ~(1 << idx)
+            length = 1 + self._longest(
+                reachable_mask(idx, rest, self._move_masks), idx)
+            if length > best_length:
+                best_move, best_length = move, length
+
+        opp_loc = game.get_player_location(game.inactive_player)
+        opp_length = self._longest(game.get_reachable_mask(game.inactive_player),
+                                   opp_loc[0] + opp_loc[1] * height)
+        return best_move, best_length, opp_length
+
+    def _longest(self, region, start):
+        key = (region, start)
+        cache = self._cache
+        length = cache.get(key)
+        if length is not None:
+            return length
+
+        self.nodes += 1
+        if self._check is not None and not self.nodes % self.CHECK_INTERVAL:
+            self._check()
+
+        move_masks = self._move_masks
+        bound = popcount(region)
+        length = 0
+        moves = move_masks[start] & region
+        while moves:
+            low_bit = moves & -moves
+            moves ^= low_bit
+            idx = low_bit.bit_length() - 1
+            sub_region = reachable_mask(idx, region ^ low_bit, move_masks)
+            sub_length = 1 + self._longest(sub_region, idx)
+            if sub_length > length:
+                length = sub_length
+                if length == bound:
+                    break
+
+        if len(cache) >= self.cache_size:
+            cache.clear()
+        cache[key] = length
+        return length
@@ -13,6 +13,128 @@ from copy import copy
 
 TIME_LIMIT_MILLIS = 150
 
+DIRECTIONS = [(-2, -1), (-2, 1), (-1, -2), (-1, 2),
+              (1, -2), (1, 2), (2, -1), (2, 1)]
+
+# Zobrist keys, knight-move masks and cell coordinates cached for each
+# (width, height)
+_zobrist_keys = {}
+_move_masks = {}
+_cell_coords = {}
+
+
+def zobrist_keys(width, height):
+    """Return the random 64-bit keys used to hash boards of the given size.
+
+    The keys are generated from a fixed seed so that every process computes
+    identical hashes for the same game state.
+
+    Parameters
+    ----------
+    width : int
+        The number of columns on the board.
+
+    height : int
+        The number of rows on the board.
+
+    Returns
+    -------
+    (list<int>, (list<int>, list<int>), int)
+        The key of each blocked cell, the keys for the location of player 1
+        and player 2 on each cell, and the key for player 2 holding the
+        initiative.
+    """
+    keys = _zobrist_keys.get((width, height))
+    if keys is None:
+        rng = random.Random("zobrist-{}x{}".format(width, height))
+        size = width * height
+        cells = [rng.getrandbits(64) for _ in range(size)]
+        locations = ([rng.getrandbits(64) for _ in range(size)],
+                     [rng.getrandbits(64) for _ in range(size)])
+        keys = (cells, locations, rng.getrandbits(64))
+        _zobrist_keys[(width, height)] = keys
+    return keys
+
+
+def knight_move_masks(width, height):
+    """Return a list containing, for every cell index on a board of the given
+    size, a bitmask of the cells a knight can reach from that cell.
+
+    Parameters
+    ----------
+    width : int
+        The number of columns on the board.
+
+    height : int
+        The number of rows on the board.
+
+    Returns
+    -------
+    list<int>
+        The knight-move bitmask of each cell, indexed by
+        `row + column * height`.
+    """
+    masks = _move_masks.get((width, height))
+    if masks is None:
+        masks = []
+        for idx in range(width * height):
+            r, c = idx % height, idx // height
+            mask = 0
+            for dr, dc in DIRECTIONS:
+                if 0 <= r + dr < height and 0 <= c + dc < width:
+                    mask |= 1 << (r + dr + (c + dc) * height)
+            masks.append(mask)
+        _move_masks[(width, height)] = masks
+    return masks
+
+
+def cell_coords(width, height):
+    """Return a list mapping each cell index to its (row, column) pair. """
+    coords = _cell_coords.get((width, height))
+    if coords is None:
+        coords = [(idx % height, idx // height)
+                  for idx in range(width * height)]
+        _cell_coords[(width, height)] = coords
+    return coords
+
+
+def popcount(mask):
+    """Return the number of set bits in a (non-negative) integer mask. """
+    return bin(mask).count("1")
+
+
+def reachable_mask(start, free, move_masks):
+    """Return a bitmask of the cells a knight can reach from the cell index
+    `start` by moving only through the cells in the bitmask `free`.
+
+    Parameters
+    ----------
+    start : int
+        The cell index of the knight (which is not included in the result
+        unless it can be reached again through the free cells).
+
+    free : int
+        A bitmask of the cells the knight may move through.
+
+    move_masks : list<int>
+        The knight-move masks returned by `knight_move_masks()`.
+
+    Returns
+    -------
+    int
+        The bitmask of reachable cells.
+    """
+    reached = frontier = move_masks[start] & free
+    while frontier:
+        expanded = 0
+        while frontier:
+            low_bit = frontier & -frontier
+            expanded |= move_masks[low_bit.bit_length() - 1]
+            frontier ^= low_bit
+        frontier = expanded & free & ~reached
+        reached |= frontier
+    return reached
+
 
 class Board(object):
     """Implement a model for the game Isolation assuming each player moves like
@@ -45,15 +167,40 @@ class Board(object):
         self._player_2 = player_2
         self._active_player = player_1
         self._inactive_player = player_2
+        self._init_cells()
 
+        # Zobrist hash of the board state, updated incrementally by
+        # apply_move(); the empty board with player 1 to move hashes to 0
+        self._zobrist = zobrist_keys(width, height)
+        self._hash = 0
+
+        # Legal moves of player 1 and player 2 in the current state, computed
+        # on demand and discarded whenever the state changes
+        self._p1_moves = None
+        self._p2_moves = None
+
+        # Previous player location and hash for each move applied with
+        # push_move(), used by pop_move() to restore the board state in-place
+        self._undo_stack = []
+
+    def _init_cells(self):
+        """Create the storage for the cells and player locations of an empty
+        board (overridden by engines that store the board differently).
+        """
         # The last 3 entries of the board state includes initiative (0 for
         # player 1, 1 for player 2) player 2 last move, and player 1 last move
-        self._board_state = [Board.BLANK] * (width * height + 3)
+        self._board_state = [Board.BLANK] * (self.width * self.height + 3)
         self._board_state[-1] = Board.NOT_MOVED
         self._board_state[-2] = Board.NOT_MOVED
 
+    def _copy_cells(self, new_board):
+        """Give a shallow copy of this board its own copy of the mutable cell
+        storage created by _init_cells().
+        """
+        new_board._board_state = copy(self._board_state)
+
     def hash(self):
-        return str(self._board_state).__hash__()
+        return self._hash
 
     @property
     def active_player(self):
@@ -92,11 +239,10 @@ class Board(object):
 
     def copy(self):
         """ Return a deep copy of the current board. """
-        new_board = Board(self._player_1, self._player_2, width=self.width, height=self.height)
-        new_board.move_count = self.move_count
-        new_board._active_player = self._active_player
-        new_board._inactive_player = self._inactive_player
-        new_board._board_state = copy(self._board_state)
+        new_board = self.__class__.__new__(self.__class__)
+        new_board.__dict__.update(self.__dict__)
+        self._copy_cells(new_board)
+        new_board._undo_stack = []
         return new_board
 
     def forecast_move(self, move):
@@ -142,6 +288,16 @@ class Board(object):
         return [(i, j) for j in range(self.width) for i in range(self.height)
                 if self._board_state[i + j * self.height] == Board.BLANK]
 
+    def get_occupancy_mask(self):
+        """Return an integer bitmask of the blocked cells on the board, where
+        the cell (row, column) corresponds to bit `row + column * height`.
+        """
+        mask = 0
+        for idx in range(self.width * self.height):
+            if self._board_state[idx] != Board.BLANK:
+                mask |= 1 << idx
+        return mask
+
     def get_player_location(self, player):
         """Find the current location of the specified player on the board.
 
@@ -188,8 +344,101 @@ class Board(object):
         """
         if player is None:
             player = self.active_player
+        return list(self._cached_moves(player))
+
+    def get_mobility(self, player):
+        """Return the legal moves available to the specified player and to
+        their opponent.
+
+        The moves of each player are generated once per game state and
+        cached until the state changes, so evaluation functions can read
+        both move lists (and their lengths) without generating them again
+        for each terminal test and mobility term.
+
+        Parameters
+        ----------
+        player : object
+            An object registered as a player in the current game.
+
+        Returns
+        -------
+        (tuple<(int, int)>, tuple<(int, int)>)
+            The legal moves of the player and the legal moves of their
+            opponent. The tuples are shared with the board and must not be
+            modified.
+        """
+        return (self._cached_moves(player),
+                self._cached_moves(self.get_opponent(player)))
+
+    def _cached_moves(self, player):
+        """Return a tuple of the legal moves for the specified player, from
+        the cache if they were already generated for the current state.
+        """
+        if player == self._player_1:
+            if self._p1_moves is None:
+                self._p1_moves = tuple(self._generate_moves(player))
+            return self._p1_moves
+        if self._p2_moves is None:
+            self._p2_moves = tuple(self._generate_moves(player))
+        return self._p2_moves
+
+    def _generate_moves(self, player):
+        """Generate the list of legal moves for the specified player. """
         return self.__get_moves(self.get_player_location(player))
 
+    def count_legal_moves(self, player=None):
+        """Return the number of legal moves for the specified player.
+
+        Parameters
+        ----------
+        player : object (optional)
+            An object registered as a player in the current game. If None,
+            count the legal moves for the active player on the board.
+
+        Returns
+        -------
+        int
+            The number of legal moves available to the player.
+        """
+        if player is None:
+            player = self.active_player
+        return len(self._cached_moves(player))
+
+    def get_reachable_mask(self, player):
+        """Return a bitmask of the blank cells the specified player could reach
+        by a sequence of knight moves if the opponent did not move, using the
+        same bit layout as `get_occupancy_mask()`.
+
+        Parameters
+        ----------
+        player : object
+            An object registered as a player in the current game.
+
+        Returns
+        -------
+        int
+            The bitmask of reachable cells (every blank cell if the player has
+            not been placed on the board yet).
+        """
+        free = ((1 << (self.width * self.height)) - 1) & ~self.get_occupancy_mask()
+        loc = self.get_player_location(player)
+        if loc is None:
+            return free
+        return reachable_mask(loc[0] + loc[1] * self.height, free,
+                              knight_move_masks(self.width, self.height))
+
+    def is_partitioned(self):
+        """Return True if the players can no longer interact, i.e. both have
+        been placed on the board and no blank cell is reachable by both.
+        Each player's outcome then only depends on the longest sequence of
+        moves available in their own region (see `isolation.endgame`).
+        """
+        if (self.get_player_location(self._active_player) is None or
+                self.get_player_location(self._inactive_player) is None):
+            return False
+        return not (self.get_reachable_mask(self._active_player) &
+                    self.get_reachable_mask(self._inactive_player))
+
     def apply_move(self, move):
         """Move the active player to a specified location.
 
@@ -201,19 +450,63 @@ class Board(object):
         """
         idx = move[0] + move[1] * self.height
         last_move_idx = int(self.active_player == self._player_2) + 1
+        cell_keys, location_keys, initiative_key = self._zobrist
+        player_keys = location_keys[last_move_idx - 1]
+        prev_idx = self._board_state[-last_move_idx]
+        if prev_idx != Board.NOT_MOVED:
+            self._hash ^= player_keys[prev_idx]
+        self._hash ^= cell_keys[idx] ^ player_keys[idx] ^ initiative_key
         self._board_state[-last_move_idx] = idx
         self._board_state[idx] = 1
         self._board_state[-3] ^= 1
         self._active_player, self._inactive_player = self._inactive_player, self._active_player
         self.move_count += 1
+        self._p1_moves = self._p2_moves = None
+
+    def push_move(self, move):
+        """Apply a move to the board in-place and record the information
+        needed to undo it with pop_move().
+
+        Unlike forecast_move(), this does not allocate a new board, so search
+        agents can explore the game tree on a single mutable board by pairing
+        each call to push_move() with a call to pop_move().
+
+        Parameters
+        ----------
+        move : (int, int)
+            A coordinate pair (row, column) indicating the next position for
+            the active player on the board.
+        """
+        last_move_idx = int(self._active_player == self._player_2) + 1
+        self._undo_stack.append((self._board_state[-last_move_idx], self._hash))
+        self.apply_move(move)
+
+    def pop_move(self):
+        """Undo the most recent move applied with push_move().
+
+        Returns
+        -------
+        (int, int)
+            The coordinate pair (row, column) of the move that was undone.
+        """
+        prev_loc, self._hash = self._undo_stack.pop()
+        self._active_player, self._inactive_player = self._inactive_player, self._active_player
+        self._board_state[-3] ^= 1
+        self.move_count -= 1
+        last_move_idx = int(self._active_player == self._player_2) + 1
+        idx = self._board_state[-last_move_idx]
+        self._board_state[idx] = Board.BLANK
+        self._board_state[-last_move_idx] = prev_loc
+        self._p1_moves = self._p2_moves = None
+        return (idx % self.height, idx // self.height)
 
     def is_winner(self, player):
         """ Test whether the specified player has won the game. """
-        return player == self._inactive_player and not self.get_legal_moves(self._active_player)
+        return player == self._inactive_player and not self._cached_moves(self._active_player)
 
     def is_loser(self, player):
         """ Test whether the specified player has lost the game. """
-        return player == self._active_player and not self.get_legal_moves(self._active_player)
+        return player == self._active_player and not self._cached_moves(self._active_player)
 
     def utility(self, player):
         """Returns the utility of the current game state from the perspective
@@ -237,7 +530,7 @@ class Board(object):
             a value of -inf if the player has lost, and a value of 0
             otherwise.
         """
-        if not self.get_legal_moves(self._active_player):
+        if not self._cached_moves(self._active_player):
 
             if player == self._inactive_player:
                 return float("inf")
@@ -295,7 +588,7 @@ class Board(object):
 
         return out
 
-    def play(self, time_limit=TIME_LIMIT_MILLIS):
+    def play(self, time_limit=TIME_LIMIT_MILLIS, timer=timeit.default_timer):
         """Execute a match between the players by alternately soliciting them
         to select a move and applying it in the game.
 
@@ -305,16 +598,31 @@ class Board(object):
             The maximum number of milliseconds to allow before timeout
             during each turn.
 
+        timer : callable (optional)
+            A function returning the current time in seconds, used to measure
+            the time taken by each turn. Use `time.process_time` to charge
+            each player only for the CPU time used by its own process (e.g.,
+            when several games are played in parallel on a busy machine).
+
         Returns
         ----------
         (player, list<[(int, int),]>, str)
             Return multiple including the winning player, the complete game
             move history, and a string indicating the reason for losing
             (e.g., timeout or invalid move).
+
+        Notes
+        -----
+            After the game, `self.move_stats` holds one dictionary per turn
+            with the number of the player who moved (1 or 2), the move
+            returned, the time taken in milliseconds, and the search
+            statistics reported by the player (the `as_dict()` value of its
+            `search_stats` attribute, or None if it has no such attribute).
         """
         move_history = []
+        self.move_stats = []
 
-        time_millis = lambda: 1000 * timeit.default_timer()
+        time_millis = lambda: 1000 * timer()
 
         while True:
 
@@ -326,6 +634,13 @@ class Board(object):
             curr_move = self._active_player.get_move(game_copy, time_left)
             move_end = time_left()
 
+            search_stats = getattr(self._active_player, "search_stats", None)
+            self.move_stats.append({
+                "player": 1 if self._active_player == self._player_1 else 2,
+                "move": curr_move,
+                "time": time_limit - move_end,
+                "search": search_stats.as_dict() if search_stats is not None else None})
+
             if curr_move is None:
                 curr_move = Board.NOT_MOVED
 
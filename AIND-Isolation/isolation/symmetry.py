@@ -0,0 +1,126 @@
+"""
+This file contains helpers for the symmetries of the Isolation board.
+
+Knight moves are unchanged by rotating or reflecting the board, so a game
+state and its mirror images have the same value and their best moves are
+mirror images of each other.  A square board has 8 symmetries (4 rotations,
+each with or without a reflection) and a rectangular board has 4 (the
+identity, the two reflections and the half turn).
+
+Each symmetry is represented as a permutation of the cell indices
+`row + column * height` used by `isolation.Board`.
+"""
+from .isolation import zobrist_keys
+
+# Cell permutations cached for each (width, height)
+_cell_transforms = {}
+
+
+def cell_transforms(width, height):
+    """Return the symmetries of a board of the given size as a list of cell
+    permutations, where `perm[idx]` is the index that the cell `idx` is
+    mapped to.  The first permutation is always the identity.
+
+    Parameters
+    ----------
+    width : int
+        The number of columns on the board.
+
+    height : int
+        The number of rows on the board.
+
+    Returns
+    -------
+    list<list<int>>
+        One permutation of the cell indices for each symmetry of the board.
+    """
+    transforms = _cell_transforms.get((width, height))
+    if transforms is None:
+        last_r, last_c = height - 1, width - 1
+        maps = [lambda r, c: (r, c),
+                lambda r, c: (last_r - r, c),
+                lambda r, c: (r, last_c - c),
+                lambda r, c: (last_r - r, last_c - c)]
+        if width == height:
+            maps += [lambda r, c: (c, r),
+                     lambda r, c: (last_c - c, r),
+                     lambda r, c: (c, last_r - r),
+                     lambda r, c: (last_c - c, last_r - r)]
+        transforms = []
+        for fn in maps:
+            perm = []
+            for idx in range(width * height):
+                r, c = fn(idx % height, idx // height)
+                perm.append(r + c * height)
+            transforms.append(perm)
+        _cell_transforms[(width, height)] = transforms
+    return transforms
+
+
+def transform_move(move, perm, height):
+    """Map a move (row, column) through a cell permutation. """
+    idx = perm[move[0] + move[1] * height]
+    return (idx % height, idx // height)
+
+
+def inverse_move(move, perm, height):
+    """Map a move (row, column) through the inverse of a cell permutation. """
+    idx = perm.index(move[0] + move[1] * height)
+    return (idx % height, idx // height)
+
+
+def player_locations(game):
+    """Return the cell indices of player 1 and player 2 (None for a player
+    who has not moved yet).
+    """
+    if game.move_count % 2:
+        p1, p2 = game.inactive_player, game.active_player
+    else:
+        p1, p2 = game.active_player, game.inactive_player
+    locations = []
+    for player in (p1, p2):
+        loc = game.get_player_location(player)
+        locations.append(None if loc is None else loc[0] + loc[1] * game.height)
+    return locations
+
+
+def canonical_key(game):
+    """Return the canonical hash of a game state and the symmetry that maps
+    the state to its canonical orientation.
+
+    The canonical hash is the smallest Zobrist hash (see `Board.hash()`) of
+    the state transformed by each symmetry of the board, so all of the
+    symmetric variants of a state share the same key.
+
+    Parameters
+    ----------
+    game : `isolation.Board`
+        The game state.
+
+    Returns
+    -------
+    (int, list<int>)
+        The canonical hash and the cell permutation that maps the game state
+        to the orientation with that hash.
+    """
+    cell_keys, location_keys, initiative_key = zobrist_keys(game.width, game.height)
+    occupied = []
+    mask = game.get_occupancy_mask()
+    while mask:
+        low_bit = mask & -mask
+        occupied.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    locations = player_locations(game)
+    initiative = initiative_key if game.move_count % 2 else 0
+
+    best = None
+    for perm in cell_transforms(game.width, game.height):
+        key = initiative
+        for idx in occupied:
+            key ^= cell_keys[perm[idx]]
+        for keys, loc in zip(location_keys, locations):
+            if loc is not None:
+                key ^= keys[perm[loc]]
+        if best is None or key < best[0]:
+            best = (key, perm)
+    return best
@@ -0,0 +1,232 @@
+"""Build and read an opening book for the game Isolation.
+
+The book maps every game state reachable in the first few plies of a game
+to the move chosen by a deep fixed-depth `AlphaBetaPlayer` search, so agents
+can play the opening without spending their time limit on positions that
+come up in almost every game.  Game states are keyed by their canonical hash
+(see `isolation.symmetry.canonical_key()`), which stores each state only
+once for all of its rotations and reflections.
+
+The book is written as a compact binary file: a header with the board size
+and number of plies, followed by one 9-byte entry (64-bit canonical hash and
+the cell index of the move in the canonical orientation) per game state.
+
+Build a book for the first four plies of a 7x7 game searched to depth 7:
+
+    python opening_book.py --plies 4 --depth 7 --workers 8
+"""
+import argparse
+import multiprocessing
+import struct
+
+from isolation import Board
+from isolation.symmetry import canonical_key, inverse_move
+from game_agent import AlphaBetaPlayer
+from sample_players import improved_score
+
+BOOK_FILE = "opening_book.bin"
+
+
+class OpeningBook:
+    """Table of precomputed moves for the game states in the first plies of
+    a game, keyed by canonical hash.
+
+    Parameters
+    ----------
+    width : int (optional)
+        The number of columns of the boards in the book.
+
+    height : int (optional)
+        The number of rows of the boards in the book.
+
+    plies : int (optional)
+        The book covers game states with fewer than this many moves applied.
+
+    moves : dict (optional)
+        Map from canonical hash to the cell index of the book move in the
+        canonical orientation of the game state.
+    """
+    MAGIC = b"ISOBOOK1"
+    HEADER = struct.Struct("<8sBBBI")
+    ENTRY = struct.Struct("<QB")
+
+    def __init__(self, width=7, height=7, plies=0, moves=None):
+        self.width = width
+        self.height = height
+        self.plies = plies
+        self.moves = moves if moves is not None else {}
+
+    def __len__(self):
+        return len(self.moves)
+
+    def covers(self, game):
+        """Return True if the game state is within the plies of the book. """
+        return (game.width == self.width and game.height == self.height and
+                game.move_count < self.plies)
+
+    def add(self, game, move):
+        """Store the book move for a game state.
+
+        Parameters
+        ----------
+        game : `isolation.Board`
+            The game state.
+
+        move : (int, int)
+            A legal move for the active player in the game state.
+        """
+        key, perm = canonical_key(game)
+        self.moves[key] = perm[move[0] + move[1] * game.height]
+
+    def lookup(self, game):
+        """Return the book move for a game state, or None if the state is not
+        in the book.
+
+        Parameters
+        ----------
+        game : `isolation.Board`
+            The game state.
+
+        Returns
+        -------
+        (int, int) or None
+            The book move for the active player, or None.
+        """
+        if not self.covers(game):
+            return None
+        key, perm = canonical_key(game)
+        idx = self.moves.get(key)
+        if idx is None:
+            return None
+        return inverse_move((idx % game.height, idx // game.height), perm,
+                            game.height)
+
+    def save(self, path):
+        """Write the book to a binary file. """
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.width, self.height,
+                                     self.plies, len(self.moves)))
+            for key in sorted(self.moves):
+                f.write(self.ENTRY.pack(key, self.moves[key]))
+
+    @classmethod
+    def load(cls, path):
+        """Read a book written by `save()`. """
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, width, height, plies, count = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError("{} is not an opening book file".format(path))
+        moves = dict(cls.ENTRY.iter_unpack(
+            data[cls.HEADER.size:cls.HEADER.size + count * cls.ENTRY.size]))
+        return cls(width, height, plies, moves)
+
+
+def opening_positions(width, height, plies):
+    """Return the move sequences leading to every distinct game state (up to
+    symmetry) with fewer than `plies` moves applied.
+
+    Returns
+    -------
+    list<list<(int, int)>>
+        One sequence of moves from the empty board for each game state.
+    """
+    frontier = [[]]
+    positions = []
+    for ply in range(plies):
+        positions.extend(frontier)
+        if ply == plies - 1:
+            break
+        seen = set()
+        next_frontier = []
+        for moves in frontier:
+            game = Board(1, 2, width, height)
+            for move in moves:
+                game.apply_move(move)
+            for move in sorted(game.get_legal_moves()):
+                child = game.forecast_move(move)
+                key, _ = canonical_key(child)
+                if key not in seen:
+                    seen.add(key)
+                    next_frontier.append(moves + [move])
+        frontier = next_frontier
+    return positions
+
+
+def search_position(task):
+    """Search the game state reached by a sequence of moves and return the
+    move sequence and the best move found (or None if there are no legal
+    moves).
+
+    The task is a tuple (moves, width, height, depth, score_fn), so it can
+    be sent to a worker process.
+    """
+    moves, width, height, depth, score_fn = task
+    player1 = AlphaBetaPlayer(search_depth=depth, score_fn=score_fn,
+                              deterministic=True)
+    player2 = AlphaBetaPlayer(search_depth=depth, score_fn=score_fn,
+                              deterministic=True)
+    game = Board(player1, player2, width, height)
+    for move in moves:
+        game.apply_move(move)
+    player = game.active_player
+    player.time_left = lambda: float("inf")
+    best_move = None
+    for d in range(1, depth + 1):
+        move = player.alphabeta(game, d)
+        if move != (-1, -1):
+            best_move = move
+    return moves, best_move
+
+
+def build_book(width=7, height=7, plies=4, depth=7, score_fn=improved_score,
+               workers=1):
+    """Search every distinct game state in the first `plies` plies of a game
+    to a fixed depth and return the resulting `OpeningBook`.
+
+    The states are searched in parallel when workers > 1.  The default
+    evaluation function is `sample_players.improved_score()`, which (unlike
+    the centrality heuristics) handles players that have not been placed on
+    the board yet.
+    """
+    tasks = [(moves, width, height, depth, score_fn)
+             for moves in opening_positions(width, height, plies)]
+    book = OpeningBook(width, height, plies)
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            results = pool.map(search_position, tasks)
+    else:
+        results = map(search_position, tasks)
+    for moves, best_move in results:
+        if best_move is None:
+            continue
+        game = Board(1, 2, width, height)
+        for move in moves:
+            game.apply_move(move)
+        book.add(game, best_move)
+    return book
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build an Isolation opening book.")
+    parser.add_argument("--width", type=int, default=7)
+    parser.add_argument("--height", type=int, default=7)
+    parser.add_argument("--plies", type=int, default=4,
+                        help="cover game states with fewer than this many "
+                             "moves applied (default: 4)")
+    parser.add_argument("--depth", type=int, default=7,
+                        help="search depth for each game state (default: 7)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (default: 1)")
+    parser.add_argument("--output", default=BOOK_FILE,
+                        help="book file to write (default: {})".format(BOOK_FILE))
+    args = parser.parse_args()
+
+    book = build_book(args.width, args.height, args.plies, args.depth,
+                      workers=args.workers)
+    book.save(args.output)
+    print("Wrote {} positions to {}".format(len(book), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Unit tests for the batch evaluation functions. """
+
+import unittest
+
+import isolation
+import game_agent
+import batch_eval
+
+from sample_players import improved_score
+from tests.test_isolation import play_random_game
+
+
+class BatchEvalTest(unittest.TestCase):
+    """Check that the batch scores match the scalar evaluation functions"""
+
+    def check_scores(self, batch_fn, score_fn, board_class, seed):
+        game = board_class("Player1", "Player2")
+        for _ in play_random_game([game], seed):
+            if game.move_count < 2:
+                continue
+            moves = game.get_legal_moves()
+            for player in ("Player1", "Player2"):
+                expected = [score_fn(game.forecast_move(m), player) for m in moves]
+                self.assertEqual(expected, batch_fn(game, moves, player))
+
+    def test_batch_improved_score(self):
+        for seed, board_class in enumerate((isolation.Board, isolation.BitBoard)):
+            self.check_scores(batch_eval.batch_improved_score, improved_score,
+                              board_class, seed)
+
+    def test_batch_custom_score(self):
+        for seed, board_class in enumerate((isolation.Board, isolation.BitBoard)):
+            self.check_scores(batch_eval.batch_custom_score,
+                              game_agent.custom_score, board_class, seed)
+
+    def test_batch_custom_score_2(self):
+        for seed, board_class in enumerate((isolation.Board, isolation.BitBoard)):
+            self.check_scores(batch_eval.batch_custom_score_2,
+                              game_agent.custom_score_2, board_class, seed)
+
+    def test_batch_custom_score_3(self):
+        for seed, board_class in enumerate((isolation.Board, isolation.BitBoard)):
+            self.check_scores(batch_eval.batch_custom_score_3,
+                              game_agent.custom_score_3, board_class, seed)
+
+    def test_alphabeta_with_batch_leaves(self):
+        moves = []
+        nodes = []
+        for batch_fn in (None, batch_eval.batch_improved_score):
+            player1 = game_agent.AlphaBetaPlayer(
+                score_fn=improved_score, batch_score_fn=batch_fn,
+                tt_size_mb=0, move_ordering=False, deterministic=True)
+            player2 = game_agent.AlphaBetaPlayer()
+            player1.time_left = lambda: 1000.
+            game = isolation.BitBoard(player1, player2)
+            for move in [(2, 3), (0, 5), (4, 4), (1, 3)]:
+                game.apply_move(move)
+            moves.append([player1.alphabeta(game, depth) for depth in range(1, 6)])
+            nodes.append(player1.search_stats.nodes)
+        self.assertEqual(moves[0], moves[1])
+        # leaves skipped by a cutoff are not counted even if they were scored
+        self.assertEqual(nodes[0], nodes[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
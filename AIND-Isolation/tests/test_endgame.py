@@ -0,0 +1,98 @@
+"""Unit tests for partition detection and the endgame solver. """
+
+import random
+import unittest
+
+import isolation
+import game_agent
+
+from isolation.endgame import EndgameSolver
+from isolation.isolation import DIRECTIONS
+from sample_players import improved_score
+
+
+def knight_moves(loc, blanks):
+    return [(loc[0] + dr, loc[1] + dc) for dr, dc in DIRECTIONS
+            if (loc[0] + dr, loc[1] + dc) in blanks]
+
+
+def reachable(loc, blanks):
+    seen = set()
+    frontier = [loc]
+    while frontier:
+        for move in knight_moves(frontier.pop(), blanks):
+            if move not in seen:
+                seen.add(move)
+                frontier.append(move)
+    return seen
+
+
+def longest_path(loc, blanks):
+    return max([1 + longest_path(move, blanks - {move})
+                for move in knight_moves(loc, blanks)] or [0])
+
+
+def partitioned_games(count, seed=0):
+    """Play random games on a 5x5 board and return the first partitioned
+    state of each game that has one.
+    """
+    rng = random.Random(seed)
+    games = []
+    while len(games) < count:
+        game = isolation.Board("Player1", "Player2", 5, 5)
+        while game.get_legal_moves():
+            game.apply_move(rng.choice(sorted(game.get_legal_moves())))
+            if game.is_partitioned():
+                games.append(game)
+                break
+    return games
+
+
+class EndgameTest(unittest.TestCase):
+    """Check partition detection and the solver against brute force"""
+
+    def test_is_partitioned_matches_flood_fill(self):
+        rng = random.Random(1)
+        for _ in range(50):
+            game = isolation.Board("Player1", "Player2", 5, 5)
+            for _ in range(2):
+                game.apply_move(rng.choice(sorted(game.get_legal_moves())))
+                self.assertFalse(game.is_partitioned())
+            while game.get_legal_moves():
+                game.apply_move(rng.choice(sorted(game.get_legal_moves())))
+                blanks = set(game.get_blank_spaces())
+                own = reachable(game.get_player_location(game.active_player), blanks)
+                opp = reachable(game.get_player_location(game.inactive_player), blanks)
+                self.assertEqual(game.is_partitioned(), not own & opp)
+
+    def test_solver_matches_brute_force(self):
+        solver = EndgameSolver()
+        for game in partitioned_games(30):
+            blanks = set(game.get_blank_spaces())
+            own_loc = game.get_player_location(game.active_player)
+            opp_loc = game.get_player_location(game.inactive_player)
+            move, own, opp = solver.solve(game)
+            self.assertEqual(own, longest_path(own_loc, blanks))
+            self.assertEqual(opp, longest_path(opp_loc, blanks))
+            if own:
+                self.assertIn(move, game.get_legal_moves())
+                self.assertEqual(1 + longest_path(move, blanks - {move}), own)
+            else:
+                self.assertEqual(move, (-1, -1))
+
+    def test_player_uses_solver_when_partitioned(self):
+        for game in partitioned_games(10, seed=2):
+            player = game_agent.AlphaBetaPlayer(score_fn=improved_score,
+                                                endgame_solver=True)
+            # no alpha-beta pass runs when the solver returns the move
+            move = player.get_move(game.copy(), lambda: 1000.)
+            blanks = set(game.get_blank_spaces())
+            own_loc = game.get_player_location(game.active_player)
+            if game.get_legal_moves():
+                self.assertEqual(1 + longest_path(move, blanks - {move}),
+                                 longest_path(own_loc, blanks))
+            self.assertEqual(player.search_stats.completed_depth, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,6 +10,22 @@ import game_agent
 
 from importlib import reload
 
+from sample_players import improved_score
+
+
+def minimax_value(game, player, depth, maximizing):
+    """Return the plain minimax value of a game state searched to a fixed
+    depth with `improved_score()` from the point of view of `player`.
+    """
+    if depth == 0:
+        return improved_score(game, player)
+    scores = [minimax_value(game.forecast_move(m), player, depth - 1,
+                            not maximizing)
+              for m in game.get_legal_moves()]
+    if not scores:
+        return improved_score(game, player)
+    return max(scores) if maximizing else min(scores)
+
 
 class IsolationTest(unittest.TestCase):
     """Unit tests for isolation agents"""
@@ -25,5 +41,184 @@ class IsolationTest(unittest.TestCase):
         self.fail("Hello, World!")
 
 
+class SearchTest(unittest.TestCase):
+    """Sanity checks for the minimax and alphabeta search agents"""
+
+    def setUp(self):
+        reload(game_agent)
+        self.time_left = lambda: 1000.
+
+    def make_game(self, player1, player2, board_class=isolation.Board):
+        game = board_class(player1, player2)
+        game.apply_move((2, 3))
+        game.apply_move((0, 5))
+        return game
+
+    def test_search_does_not_modify_board(self):
+        for board_class in (isolation.Board, isolation.BitBoard):
+            for player_class in (game_agent.MinimaxPlayer,
+                                 game_agent.AlphaBetaPlayer):
+                player1 = player_class(search_depth=3)
+                player2 = player_class(search_depth=3)
+                game = self.make_game(player1, player2, board_class)
+                before = game.to_string()
+                player1.time_left = self.time_left
+                if player_class is game_agent.MinimaxPlayer:
+                    move = player1.minimax(game, 3)
+                else:
+                    move = player1.alphabeta(game, 3)
+                self.assertIn(move, game.get_legal_moves())
+                self.assertEqual(before, game.to_string())
+
+
+    def test_alphabeta_matches_minimax_value(self):
+        for board_class in (isolation.Board, isolation.BitBoard):
+            for tt_size_mb in (0, 1):
+                player1 = game_agent.AlphaBetaPlayer(score_fn=improved_score,
+                                                     tt_size_mb=tt_size_mb)
+                player2 = game_agent.AlphaBetaPlayer(score_fn=improved_score)
+                player1.time_left = self.time_left
+                game = self.make_game(player1, player2, board_class)
+                game.apply_move((4, 4))
+                game.apply_move((1, 3))
+                for depth in range(1, 5):
+                    move = player1.alphabeta(game, depth)
+                    best = max(minimax_value(game.forecast_move(m), player1,
+                                             depth - 1, False)
+                               for m in game.get_legal_moves())
+                    self.assertEqual(best, minimax_value(
+                        game.forecast_move(move), player1, depth - 1, False))
+
+
+    def test_transposition_table_bounds(self):
+        from tests.test_isolation import play_random_game
+        for seed in range(3):
+            player1 = game_agent.AlphaBetaPlayer(score_fn=improved_score)
+            player2 = game_agent.AlphaBetaPlayer(score_fn=improved_score)
+            player1.time_left = self.time_left
+            game = isolation.Board(player1, player2)
+            for _ in play_random_game([game], seed):
+                if game.move_count >= 12:
+                    break
+            if game.active_player is not player1:
+                game.apply_move(game.get_legal_moves()[0])
+
+            # record every entry stored in the table, along with the game
+            # states the search can reach, indexed by their hash
+            stored = []
+            store = player1.tt.store
+            def record_store(key, depth, score, flag, best_move):
+                stored.append((key, depth, score, flag))
+                store(key, depth, score, flag, best_move)
+            player1.tt.store = record_store
+            states = {}
+            def reachable(game, depth):
+                states[game.hash()] = game
+                if depth:
+                    for m in game.get_legal_moves():
+                        reachable(game.forecast_move(m), depth - 1)
+            reachable(game, 4)
+
+            for depth in range(1, 5):
+                player1.alphabeta(game, depth)
+            self.assertTrue(stored)
+            for key, depth, score, flag in stored:
+                state = states[key]
+                # solved entries end the game within the deepest pass
+                value = minimax_value(state, player1, min(depth, 4),
+                                      state.active_player is player1)
+                if flag == game_agent.TranspositionTable.EXACT:
+                    self.assertEqual(score, value)
+                elif flag == game_agent.TranspositionTable.LOWER:
+                    self.assertGreaterEqual(value, score)
+                else:
+                    self.assertLessEqual(value, score)
+
+
+    def test_move_ordering_reduces_nodes(self):
+        node_counts = []
+        for move_ordering in (False, True):
+            player1 = game_agent.AlphaBetaPlayer(
+                score_fn=improved_score, tt_size_mb=0,
+                move_ordering=move_ordering, deterministic=True)
+            player2 = game_agent.AlphaBetaPlayer()
+            player1.time_left = self.time_left
+            game = self.make_game(player1, player2, isolation.BitBoard)
+            game.apply_move((4, 4))
+            game.apply_move((1, 3))
+            stats = player1.search_stats
+            for depth in range(1, 7):
+                nodes = stats.nodes
+                player1.alphabeta(game, depth)
+                stats.depth_nodes.append(stats.nodes - nodes)
+            self.assertIsNotNone(stats.effective_branching_factor)
+            node_counts.append(stats.nodes)
+        self.assertLess(node_counts[1], node_counts[0])
+
+
+    def test_search_stats_recorded_by_play(self):
+        player1 = game_agent.AlphaBetaPlayer()
+        player2 = game_agent.AlphaBetaPlayer()
+        game = self.make_game(player1, player2, isolation.BitBoard)
+        game.play(time_limit=50)
+        for record in game.move_stats:
+            stats = record["search"]
+            self.assertIsNotNone(stats)
+            self.assertGreaterEqual(stats["completed_depth"], 1)
+            self.assertEqual(len(stats["depth_nodes"]), stats["completed_depth"])
+            self.assertGreaterEqual(stats["nodes"], stats["leaf_evaluations"])
+            self.assertGreaterEqual(record["time"], stats["search_time"])
+
+
+    def test_lost_position_returns_legal_move(self):
+        for player_class in (game_agent.MinimaxPlayer,
+                             game_agent.AlphaBetaPlayer):
+            player1 = player_class()
+            player2 = player_class()
+            game = isolation.Board(player1, player2, 5, 5)
+            for move in [(1, 2), (2, 0), (0, 0), (4, 1), (2, 1), (3, 3),
+                         (1, 3), (1, 4), (0, 1), (0, 2), (2, 2), (2, 3),
+                         (0, 3), (1, 1), (2, 4), (3, 2), (4, 3)]:
+                game.apply_move(move)
+            # player 2 can move to (4, 0) or (4, 4), and player 1 has a reply
+            # to either move that leaves player 2 with no legal moves
+            moves = game.get_legal_moves()
+            self.assertEqual(sorted(moves), [(4, 0), (4, 4)])
+            player2.time_left = self.time_left
+            if player_class is game_agent.MinimaxPlayer:
+                move = player2.minimax(game, 3)
+            else:
+                move = player2.alphabeta(game, 3)
+            self.assertIn(move, moves)
+
+
+    def test_get_move_stops_when_search_is_exhaustive(self):
+        player1 = game_agent.AlphaBetaPlayer()
+        player2 = game_agent.AlphaBetaPlayer()
+        game = isolation.Board(player1, player2, 5, 5)
+        for move in [(1, 2), (2, 0), (0, 0), (4, 1), (2, 1), (3, 3), (1, 3),
+                     (1, 4)]:
+            game.apply_move(move)
+        # the clock never runs out, so get_move() only returns if iterative
+        # deepening stops once no line reaches the depth limit (the game
+        # cannot last more plies than there are blank cells)
+        move = player1.get_move(game.copy(), self.time_left)
+        stats = player1.search_stats
+        self.assertIn(move, game.get_legal_moves())
+        self.assertLessEqual(stats.completed_depth, len(game.get_blank_spaces()))
+        self.assertGreater(stats.tt_hits, 0)
+
+    def test_next_depth_fits(self):
+        player = game_agent.AlphaBetaPlayer(timeout=10.)
+        player.time_left = lambda: 100.
+        self.assertTrue(player.next_depth_fits())
+        player.search_stats.depth_nodes = [10, 40]
+        player.search_stats.depth_times = [5., 20.]
+        # the next pass is expected to take 20ms * 4 = 80ms < 100ms - 10ms
+        self.assertTrue(player.next_depth_fits())
+        player.search_stats.depth_times = [5., 25.]
+        self.assertFalse(player.next_depth_fits())
+
+
 if __name__ == '__main__':
     unittest.main()
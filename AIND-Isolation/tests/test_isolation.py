@@ -0,0 +1,151 @@
+"""Unit tests for the `isolation` game engines. """
+
+import random
+import unittest
+
+import isolation
+
+
+def play_random_game(boards, seed=0):
+    """Apply the same random sequence of legal moves to every board in
+    `boards` and yield after each move so the engines can be compared.
+    """
+    rng = random.Random(seed)
+    while True:
+        moves = sorted(boards[0].get_legal_moves())
+        if not moves:
+            return
+        move = rng.choice(moves)
+        for board in boards:
+            board.apply_move(move)
+        yield move
+
+
+class BitBoardTest(unittest.TestCase):
+    """Check that `BitBoard` matches the reference `Board` engine. """
+
+    def setUp(self):
+        self.player1 = "Player1"
+        self.player2 = "Player2"
+
+    def assertSameState(self, board, bitboard):
+        for player in (self.player1, self.player2):
+            self.assertEqual(board.get_player_location(player),
+                             bitboard.get_player_location(player))
+            self.assertEqual(sorted(board.get_legal_moves(player)),
+                             sorted(bitboard.get_legal_moves(player)))
+            self.assertEqual(board.count_legal_moves(player),
+                             bitboard.count_legal_moves(player))
+            self.assertEqual(board.utility(player), bitboard.utility(player))
+        self.assertEqual(sorted(board.get_blank_spaces()),
+                         sorted(bitboard.get_blank_spaces()))
+        self.assertEqual(board.to_string(), bitboard.to_string())
+        self.assertEqual(board.active_player, bitboard.active_player)
+        self.assertEqual(board.move_count, bitboard.move_count)
+        self.assertEqual(board._board_state, bitboard._board_state)
+
+    def test_random_games_match_reference(self):
+        for seed, (width, height) in enumerate([(7, 7), (5, 8), (9, 6)]):
+            board = isolation.Board(self.player1, self.player2, width, height)
+            bitboard = isolation.BitBoard(self.player1, self.player2, width, height)
+            self.assertSameState(board, bitboard)
+            for _ in play_random_game([board, bitboard], seed):
+                self.assertSameState(board, bitboard)
+                self.assertFalse(bitboard.move_is_legal(
+                    bitboard.get_player_location(bitboard.inactive_player)))
+
+    def test_forecast_move_does_not_modify_board(self):
+        bitboard = isolation.BitBoard(self.player1, self.player2)
+        bitboard.apply_move((2, 3))
+        bitboard.apply_move((0, 5))
+        before = bitboard.to_string()
+        new_board = bitboard.forecast_move((1, 1))
+        self.assertEqual(before, bitboard.to_string())
+        self.assertNotEqual(before, new_board.to_string())
+        self.assertEqual(new_board.get_player_location(self.player1), (1, 1))
+        self.assertNotEqual(bitboard.hash(), new_board.hash())
+        self.assertIsInstance(new_board, isolation.BitBoard)
+        self.assertIsInstance(isolation.Board("Player1", "Player2").copy(),
+                              isolation.Board)
+
+    def test_hash_is_incremental_zobrist(self):
+        board = isolation.Board(self.player1, self.player2)
+        bitboard = isolation.BitBoard(self.player1, self.player2)
+        self.assertEqual(board.hash(), 0)
+        seen = {}
+        for _ in play_random_game([board, bitboard], seed=7):
+            self.assertEqual(board.hash(), bitboard.hash())
+            self.assertEqual(board.hash(), board.copy().hash())
+            self.assertNotIn(board.hash(), seen)
+            seen[board.hash()] = board.to_string()
+
+    def test_hash_depends_on_state_not_history(self):
+        board = isolation.Board(self.player1, self.player2)
+        for move in [(0, 0), (6, 6), (1, 2), (4, 5), (3, 3)]:
+            board.apply_move(move)
+        other = isolation.Board(self.player1, self.player2)
+        for move in [(1, 2), (6, 6), (0, 0), (4, 5), (3, 3)]:
+            other.apply_move(move)
+        # both boards block the same cells with the same player locations
+        self.assertEqual(board.to_string(), other.to_string())
+        self.assertEqual(board.hash(), other.hash())
+
+
+class PushPopTest(unittest.TestCase):
+    """Check that pop_move() exactly undoes push_move() on every engine. """
+
+    def test_push_pop_restores_state(self):
+        for board_class in (isolation.Board, isolation.BitBoard):
+            board = board_class("Player1", "Player2")
+            for _ in play_random_game([board], seed=3):
+                before = (board.to_string(), board.hash(), board.move_count,
+                          board.active_player, sorted(board.get_legal_moves()))
+                for move in board.get_legal_moves():
+                    board.push_move(move)
+                    self.assertEqual(board.pop_move(), move)
+                    after = (board.to_string(), board.hash(), board.move_count,
+                             board.active_player, sorted(board.get_legal_moves()))
+                    self.assertEqual(before, after)
+
+    def test_push_matches_forecast(self):
+        for board_class in (isolation.Board, isolation.BitBoard):
+            board = board_class("Player1", "Player2")
+            board.apply_move((2, 3))
+            board.apply_move((0, 5))
+            for move in board.get_legal_moves():
+                expected = board.forecast_move(move).to_string()
+                board.push_move(move)
+                self.assertEqual(expected, board.to_string())
+                board.pop_move()
+
+
+class MobilityTest(unittest.TestCase):
+    """Check the cached mobility summary stays in sync with the board. """
+
+    def test_mobility_matches_legal_moves(self):
+        for board_class in (isolation.Board, isolation.BitBoard):
+            board = board_class("Player1", "Player2")
+            for _ in play_random_game([board], seed=5):
+                own, opp = board.get_mobility("Player1")
+                self.assertEqual(sorted(own), sorted(board._generate_moves("Player1")))
+                self.assertEqual(sorted(opp), sorted(board._generate_moves("Player2")))
+                self.assertEqual((opp, own), board.get_mobility("Player2"))
+                for move in own if board.active_player == "Player1" else opp:
+                    board.push_move(move)
+                    self.assertEqual(sorted(board.get_legal_moves("Player1")),
+                                     sorted(board._generate_moves("Player1")))
+                    board.pop_move()
+                self.assertEqual([sorted(own), sorted(opp)],
+                                 [sorted(moves) for moves in board.get_mobility("Player1")])
+
+    def test_legal_moves_are_copies(self):
+        board = isolation.Board("Player1", "Player2")
+        board.apply_move((2, 3))
+        board.apply_move((0, 5))
+        board.get_legal_moves().clear()
+        self.assertEqual(board.count_legal_moves(), 8)
+        self.assertEqual(len(board.get_legal_moves()), 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
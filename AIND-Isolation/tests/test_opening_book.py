@@ -0,0 +1,91 @@
+"""Unit tests for the board symmetries and the opening book. """
+
+import os
+import tempfile
+import unittest
+
+import isolation
+import competition_agent
+import opening_book
+
+from isolation.symmetry import cell_transforms, canonical_key, transform_move
+
+
+class SymmetryTest(unittest.TestCase):
+    """Check that symmetric game states share a canonical key"""
+
+    def play(self, moves, perm=None, width=7, height=7):
+        game = isolation.Board("Player1", "Player2", width, height)
+        for move in moves:
+            game.apply_move(move if perm is None else
+                            transform_move(move, perm, height))
+        return game
+
+    def test_symmetric_states_share_canonical_key(self):
+        moves = [(0, 1), (3, 3), (2, 2), (5, 4), (4, 3)]
+        for width, height, count in [(7, 7, 8), (5, 8, 4)]:
+            transforms = cell_transforms(width, height)
+            self.assertEqual(len(transforms), count)
+            key, _ = canonical_key(self.play(moves, width=width, height=height))
+            for perm in transforms:
+                game = self.play(moves, perm, width, height)
+                self.assertEqual(key, canonical_key(game)[0])
+            other = self.play(moves[:-1] + [(1, 1)], width=width, height=height)
+            self.assertNotEqual(key, canonical_key(other)[0])
+
+    def test_canonical_key_is_smallest_symmetric_hash(self):
+        game = self.play([(1, 2), (4, 4), (3, 3)])
+        key, perm = canonical_key(game)
+        self.assertLessEqual(key, game.hash())
+        self.assertEqual(key, self.play([(1, 2), (4, 4), (3, 3)], perm).hash())
+
+
+class OpeningBookTest(unittest.TestCase):
+    """Build a small book and check that it plays symmetric moves"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.book = opening_book.build_book(width=5, height=5, plies=3, depth=2)
+
+    def test_book_moves_are_legal_and_symmetric(self):
+        positions = opening_book.opening_positions(5, 5, 3)
+        self.assertEqual(len(self.book), len(positions))
+        for moves in positions:
+            for perm in cell_transforms(5, 5):
+                game = isolation.Board("Player1", "Player2", 5, 5)
+                for move in moves:
+                    game.apply_move(transform_move(move, perm, 5))
+                book_move = self.book.lookup(game)
+                self.assertIn(book_move, game.get_legal_moves())
+        game = isolation.Board("Player1", "Player2", 5, 5)
+        for move in [(0, 0), (4, 4), (1, 2)]:
+            game.apply_move(move)
+        self.assertIsNone(self.book.lookup(game))
+        self.assertIsNone(self.book.lookup(isolation.Board("Player1", "Player2")))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.bin")
+            self.book.save(path)
+            self.assertEqual(os.path.getsize(path), opening_book.OpeningBook.HEADER.size +
+                             len(self.book) * opening_book.OpeningBook.ENTRY.size)
+            loaded = opening_book.OpeningBook.load(path)
+        self.assertEqual((loaded.width, loaded.height, loaded.plies),
+                         (5, 5, 3))
+        self.assertEqual(loaded.moves, self.book.moves)
+
+    def test_custom_player_plays_from_book(self):
+        player1 = competition_agent.CustomPlayer(book=self.book)
+        player2 = competition_agent.CustomPlayer(book=None)
+        game = isolation.Board(player1, player2, 5, 5)
+        game.apply_move((2, 2))
+        move = player2.get_move(game.copy(), lambda: 1000.)
+        self.assertIn(move, game.get_legal_moves())
+        game.apply_move((0, 1))
+        move = player1.get_move(game.copy(), lambda: 1000.)
+        self.assertEqual(move, self.book.lookup(game))
+        self.assertEqual(player1.search_stats.nodes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
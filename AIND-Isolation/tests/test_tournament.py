@@ -0,0 +1,45 @@
+"""Unit tests for the tournament runner. """
+
+import multiprocessing
+import random
+import unittest
+
+import tournament
+
+from sample_players import RandomPlayer, GreedyPlayer
+
+
+class PlayRoundTest(unittest.TestCase):
+    """Check that parallel rounds reproduce the results of serial rounds"""
+
+    def setUp(self):
+        self.cpu_agent = tournament.Agent(RandomPlayer(), "Random")
+        self.test_agents = [tournament.Agent(GreedyPlayer(), "Greedy"),
+                            tournament.Agent(RandomPlayer(), "Random_2")]
+
+    def play(self, pool):
+        wins = {agent.player: 0 for agent in self.test_agents}
+        wins[self.cpu_agent.player] = 0
+        counts = tournament.play_round(self.cpu_agent, self.test_agents, wins,
+                                       3, pool=pool, rng=random.Random(42))
+        return [wins[agent.player] for agent in self.test_agents], counts
+
+    def test_parallel_round_matches_serial_round(self):
+        serial = self.play(None)
+        with multiprocessing.Pool(2) as pool:
+            parallel = self.play(pool)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(serial[1], (0, 0))
+        self.assertLessEqual(sum(serial[0]), 2 * 3 * len(self.test_agents))
+
+    def test_serial_round_keeps_global_random_state(self):
+        random.seed(7)
+        expected = random.random()
+        random.seed(7)
+        self.play(None)
+        self.assertEqual(expected, random.random())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,14 +10,23 @@ The matches are fair because the board is initialized randomly for both
 players, and the players play each match twice -- once as the first player and
 once as the second player.  Randomizing the openings and switching the player
 order corrects for imbalances due to both starting position and initiative.
+
+Games can be played in parallel worker processes with the `--workers` option.
+Each game is played by fresh (unpickled) copies of the two agents with its own
+random seed, and each turn is timed with the CPU time of the worker process so
+that the time limit stays fair when every core is busy.
 """
+import argparse
 import itertools
+import multiprocessing
 import random
+import time
+import timeit
 import warnings
 
 from collections import namedtuple
 
-from isolation import Board
+from isolation import Board, BitBoard
 from sample_players import (RandomPlayer, open_move_score,
                             improved_score, center_score)
 from game_agent import (MinimaxPlayer, AlphaBetaPlayer, custom_score,
@@ -36,37 +45,123 @@ game_agent.py.
 
 Agent = namedtuple("Agent", ["player", "name"])
 
+# A single game between a cpu agent and the test agent at index `test_index`
+GameTask = namedtuple("GameTask", ["cpu_player", "test_player", "test_index",
+                                   "cpu_first", "opening", "seed",
+                                   "time_limit", "board_class", "timer"])
+
+
+def summarize_search_stats(move_stats, player_number):
+    """Aggregate the per-move search statistics recorded by `Board.play()` for
+    the moves made by one player (1 or 2) in a game.
 
-def play_round(cpu_agent, test_agents, win_counts, num_matches):
+    Returns
+    -------
+    dict
+        The number of searched moves, the total nodes, leaf evaluations,
+        cutoffs, transposition table hits, completed depth and search time (ms) over those moves, and
+        the smallest timeout margin (ms) of any move.
+    """
+    summary = {"moves": 0, "nodes": 0, "leaf_evaluations": 0, "cutoffs": 0,
+               "tt_hits": 0, "completed_depth": 0, "search_time": 0., "timeout_margin": None}
+    for record in move_stats:
+        if record["player"] != player_number or record["search"] is None:
+            continue
+        summary = merge_search_stats(summary, dict(record["search"], moves=1))
+    return summary
+
+
+def merge_search_stats(total, summary):
+    """Combine two summaries produced by `summarize_search_stats()`. """
+    merged = {key: total[key] + summary[key]
+              for key in ("moves", "nodes", "leaf_evaluations", "cutoffs",
+                          "tt_hits", "completed_depth", "search_time")}
+    margins = [m for m in (total["timeout_margin"], summary["timeout_margin"])
+               if m is not None]
+    merged["timeout_margin"] = min(margins) if margins else None
+    return merged
+
+
+def play_game(task):
+    """Play the game described by a `GameTask` and return a tuple
+    (test_index, test_won, termination, search_stats), where search_stats
+    summarizes the searches of the test agent (see
+    `summarize_search_stats()`).
+
+    The global random number generator is seeded from the task so that the
+    random choices made by the board and the agents can be reproduced, and
+    its previous state is restored when the game ends.
+    """
+    random_state = random.getstate()
+    random.seed(task.seed)
+    try:
+        if task.cpu_first:
+            game = task.board_class(task.cpu_player, task.test_player)
+        else:
+            game = task.board_class(task.test_player, task.cpu_player)
+        for move in task.opening:
+            game.apply_move(move)
+        winner, _, termination = game.play(time_limit=task.time_limit,
+                                           timer=task.timer)
+    finally:
+        random.setstate(random_state)
+    search_stats = summarize_search_stats(game.move_stats,
+                                          2 if task.cpu_first else 1)
+    return task.test_index, winner is task.test_player, termination, search_stats
+
+
+def play_round(cpu_agent, test_agents, win_counts, num_matches, pool=None,
+               rng=random, board_class=Board, search_stats=None):
     """Compare the test agents to the cpu agent in "fair" matches.
 
     "Fair" matches use random starting locations and force the agents to
     play as both first and second player to control for advantages resulting
     from choosing better opening moves or having first initiative to move.
+
+    If a `multiprocessing.Pool` is provided, the games are played in the
+    worker processes and timed with the CPU time of each worker; otherwise
+    they are played one after another in the current process.
+
+    If a dictionary is provided for `search_stats`, the summaries of the
+    searches of each test agent are merged into it (keyed by player).
     """
-    timeout_count = 0
-    forfeit_count = 0
+    timer = time.process_time if pool is not None else timeit.default_timer
+    tasks = []
     for _ in range(num_matches):
 
-        games = sum([[Board(cpu_agent.player, agent.player),
-                      Board(agent.player, cpu_agent.player)]
-                    for agent in test_agents], [])
-
         # initialize all games with a random move and response
+        board = board_class(1, 2)
+        opening = []
         for _ in range(2):
-            move = random.choice(games[0].get_legal_moves())
-            for game in games:
-                game.apply_move(move)
-
-        # play all games and tally the results
-        for game in games:
-            winner, _, termination = game.play(time_limit=TIME_LIMIT)
-            win_counts[winner] += 1
-
-            if termination == "timeout":
-                timeout_count += 1
-            elif termination == "forfeit":
-                forfeit_count += 1
+            move = rng.choice(sorted(board.get_legal_moves()))
+            board.apply_move(move)
+            opening.append(move)
+
+        for idx, agent in enumerate(test_agents):
+            for cpu_first in (True, False):
+                tasks.append(GameTask(cpu_agent.player, agent.player, idx,
+                                      cpu_first, opening, rng.getrandbits(32),
+                                      TIME_LIMIT, board_class, timer))
+
+    # play all games and tally the results
+    results = pool.imap(play_game, tasks) if pool is not None else map(play_game, tasks)
+    timeout_count = 0
+    forfeit_count = 0
+    for test_index, test_won, termination, stats in results:
+        if search_stats is not None:
+            player = test_agents[test_index].player
+            search_stats[player] = (merge_search_stats(search_stats[player], stats)
+                                    if player in search_stats else stats)
+
+        if test_won:
+            win_counts[test_agents[test_index].player] += 1
+        else:
+            win_counts[cpu_agent.player] += 1
+
+        if termination == "timeout":
+            timeout_count += 1
+        elif termination == "forfeit":
+            forfeit_count += 1
 
     return timeout_count, forfeit_count
 
@@ -77,15 +172,15 @@ def update(total_wins, wins):
     return total_wins
 
 
-def play_matches(cpu_agents, test_agents, num_matches):
-    """Play matches between the test agent and each cpu_agent individually. """
+def play_rounds(cpu_agents, test_agents, num_matches, pool, rng, board_class,
+                search_stats):
+    """Play a round of matches between the test agents and each cpu agent,
+    printing the results of each round, and return a tuple (total_wins,
+    total_timeouts, total_forfeits).
+    """
     total_wins = {agent.player: 0 for agent in test_agents}
     total_timeouts = 0.
     total_forfeits = 0.
-    total_matches = 2 * num_matches * len(cpu_agents)
-
-    print("\n{:^9}{:^13}".format("Match #", "Opponent") + ''.join(['{:^13}'.format(x[1].name) for x in enumerate(test_agents)]))
-    print("{:^9}{:^13} ".format("", "") +  ' '.join(['{:^5}| {:^5}'.format("Won", "Lost") for x in enumerate(test_agents)]))
 
     for idx, agent in enumerate(cpu_agents):
         wins = {key: 0 for (key, value) in test_agents}
@@ -93,7 +188,9 @@ def play_matches(cpu_agents, test_agents, num_matches):
 
         print("{!s:^9}{:^13}".format(idx + 1, agent.name), end="", flush=True)
 
-        counts = play_round(agent, test_agents, wins, num_matches)
+        counts = play_round(agent, test_agents, wins, num_matches, pool=pool,
+                            rng=rng, board_class=board_class,
+                            search_stats=search_stats)
         total_timeouts += counts[0]
         total_forfeits += counts[1]
         total_wins = update(total_wins, wins)
@@ -106,6 +203,35 @@ def play_matches(cpu_agents, test_agents, num_matches):
             ) for i in range(0, len(round_totals), 2)
         ]))
 
+    return total_wins, total_timeouts, total_forfeits
+
+
+def play_matches(cpu_agents, test_agents, num_matches, workers=1, seed=None,
+                 board_class=Board, show_stats=False):
+    """Play matches between the test agent and each cpu_agent individually.
+
+    Games are distributed over `workers` processes when workers > 1, and the
+    openings and per-game random seeds are drawn from a generator seeded
+    with `seed` so that repeated tournaments play the same games.  If
+    `show_stats` is True, a summary of the searches performed by each test
+    agent is printed after the results.
+    """
+    rng = random.Random(seed)
+    search_stats = {}
+    total_matches = 2 * num_matches * len(cpu_agents)
+
+    print("\n{:^9}{:^13}".format("Match #", "Opponent") + ''.join(['{:^13}'.format(x[1].name) for x in enumerate(test_agents)]))
+    print("{:^9}{:^13} ".format("", "") +  ' '.join(['{:^5}| {:^5}'.format("Won", "Lost") for x in enumerate(test_agents)]))
+
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            totals = play_rounds(cpu_agents, test_agents, num_matches, pool,
+                                 rng, board_class, search_stats)
+    else:
+        totals = play_rounds(cpu_agents, test_agents, num_matches, None,
+                             rng, board_class, search_stats)
+    total_wins, total_timeouts, total_forfeits = totals
+
     print("-" * 74)
     print('{:^9}{:^13}'.format("", "Win Rate:") +
         ''.join([
@@ -114,6 +240,9 @@ def play_matches(cpu_agents, test_agents, num_matches):
             ) for x in enumerate(test_agents)
     ]))
 
+    if show_stats:
+        print_search_stats(test_agents, search_stats)
+
     if total_timeouts:
         print(("\nThere were {} timeouts during the tournament -- make sure " +
                "your agent handles search timeout correctly, and consider " +
@@ -124,7 +253,43 @@ def play_matches(cpu_agents, test_agents, num_matches):
                "legal moves available to play.\n").format(total_forfeits))
 
 
+def print_search_stats(test_agents, search_stats):
+    """Print the average search depth, speed, cutoff and transposition table
+    hit rates and smallest timeout margin of each test agent over the
+    tournament.
+    """
+    rows = [("Avg depth:", lambda s: "{:.2f}".format(s["completed_depth"] / s["moves"])),
+            ("Nodes/sec:", lambda s: "{:.0f}".format(1000 * s["nodes"] / s["search_time"])
+                           if s["search_time"] > 0 else "-"),
+            ("Cutoffs/node:", lambda s: "{:.3f}".format(s["cutoffs"] / s["nodes"])
+                              if s["nodes"] else "-"),
+            ("TT hits/node:", lambda s: "{:.3f}".format(s["tt_hits"] / s["nodes"])
+                              if s["nodes"] else "-"),
+            ("Min margin:", lambda s: "{:.1f}ms".format(s["timeout_margin"])
+                            if s["timeout_margin"] is not None else "-")]
+    print()
+    for label, fmt in rows:
+        print('{:^9}{:^13}'.format("", label) + ''.join([
+            '{:^13}'.format(fmt(search_stats[agent.player])
+                            if search_stats.get(agent.player, {}).get("moves") else "-")
+            for agent in test_agents]))
+
+
 def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes used to play games "
+                             "in parallel (default: 1)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for the openings and games")
+    parser.add_argument("--matches", type=int, default=NUM_MATCHES,
+                        help="number of matches against each opponent "
+                             "(default: {})".format(NUM_MATCHES))
+    parser.add_argument("--bitboard", action="store_true",
+                        help="play the games on isolation.BitBoard")
+    parser.add_argument("--stats", action="store_true",
+                        help="report search statistics for the test agents")
+    args = parser.parse_args()
 
     # Define two agents to compare -- these agents will play from the same
     # starting position against the same adversaries in the tournament
@@ -150,7 +315,9 @@ def main():
     print("{:^74}".format("*************************"))
     print("{:^74}".format("Playing Matches"))
     print("{:^74}".format("*************************"))
-    play_matches(cpu_agents, test_agents, NUM_MATCHES)
+    play_matches(cpu_agents, test_agents, args.matches, workers=args.workers,
+                 seed=args.seed, board_class=BitBoard if args.bitboard else Board,
+                 show_stats=args.stats)
 
 
 if __name__ == "__main__":